@@ -0,0 +1,141 @@
+"""
+Two-tier caches for upstream service results.
+
+Lookups go to an in-process TTL cache first, then to Redis when REDIS_URL is
+configured (so every worker process shares hits), and only then upstream.
+"""
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+import orjson
+from cachetools import TTLCache
+
+from app.config import get_settings
+
+try:
+    from redis import asyncio as aioredis
+    from redis.exceptions import RedisError
+except ImportError:  # Redis is optional - without it only the in-process tier is used
+    aioredis = None
+    RedisError = OSError
+
+
+logger = logging.getLogger(__name__)
+
+# Prefix for every key we write, so DayMate can share a Redis instance
+REDIS_KEY_PREFIX = "daymate"
+
+_redis = None
+
+
+def get_redis():
+    """Return the shared Redis client, or None when REDIS_URL is not configured."""
+    global _redis
+    redis_url = get_settings().redis_url
+    if _redis is None and aioredis is not None and redis_url:
+        _redis = aioredis.Redis.from_url(redis_url)
+    return _redis
+
+
+async def close_redis() -> None:
+    """Close the shared Redis client (called on app shutdown)."""
+    global _redis
+    if _redis is not None:
+        await _redis.close()
+        _redis = None
+
+
+class ServiceCache:
+    """TTL cache with per-key single-flight loading for async callers."""
+
+    def __init__(self, namespace: str, ttl: int, maxsize: int = 1024):
+        self.namespace = namespace
+        self.ttl = ttl
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._inflight: Dict[Hashable, "asyncio.Future[Tuple[dict, bool]]"] = {}
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[dict]]) -> Tuple[dict, bool]:
+        """
+        Return the cached result for a key, loading it at most once per key.
+
+        Concurrent callers for the same key share the first caller's in-flight
+        load instead of each hitting the upstream API, and all get its result -
+        including an error, so an outage costs one upstream call rather than one
+        per queued caller. Results flagged with "error" are returned but never
+        cached.
+
+        Args:
+            key: Normalized cache key (e.g. lowercased city or rounded coordinates)
+            loader: Coroutine function producing the service result on a miss
+
+        Returns:
+            Tuple of (result, cache_hit)
+        """
+        if key in self._cache:
+            return self._cache[key], True
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, loader))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded so one caller being cancelled doesn't cancel the shared load
+        return await asyncio.shield(task)
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[dict]]) -> Tuple[dict, bool]:
+        result = await self.get(key)
+        if result is not None:
+            return result, True
+
+        result = await loader()
+        if not result.get("error", False):
+            await self.set(key, result)
+        return result, False
+
+    async def get(self, key: Hashable) -> Optional[dict]:
+        """Return the cached result for a key from either tier, or None on a miss."""
+        if key in self._cache:
+            return self._cache[key]
+
+        result = await self._redis_get(key)
+        if result is not None:
+            self._cache[key] = result
+        return result
+
+    async def set(self, key: Hashable, result: dict) -> None:
+        """Store a result in both tiers."""
+        self._cache[key] = result
+        await self._redis_set(key, result)
+
+    def _redis_key(self, key: Hashable) -> str:
+        if isinstance(key, tuple):
+            key = ",".join(str(part) for part in key)
+        return f"{REDIS_KEY_PREFIX}:{self.namespace}:{key}"
+
+    async def _redis_get(self, key: Hashable) -> Optional[dict]:
+        client = get_redis()
+        if client is None:
+            return None
+        try:
+            raw = await client.get(self._redis_key(key))
+        except RedisError as e:
+            logger.warning("Redis GET failed for %s: %s", self._redis_key(key), e)
+            return None
+        return orjson.loads(raw) if raw is not None else None
+
+    async def _redis_set(self, key: Hashable, result: dict) -> None:
+        client = get_redis()
+        if client is None:
+            return
+        try:
+            await client.setex(self._redis_key(key), self.ttl, orjson.dumps(result))
+        except RedisError as e:
+            logger.warning("Redis SETEX failed for %s: %s", self._redis_key(key), e)
+
+
+def cache_key(city: str = None, latitude: float = None, longitude: float = None) -> Hashable:
+    """Build a cache key from rounded coordinates (~1 km) or a normalized city name."""
+    if latitude is not None and longitude is not None:
+        return (round(latitude, 2), round(longitude, 2))
+    return (city or "").strip().lower()
@@ -0,0 +1,61 @@
+"""
+Application settings, parsed once from the environment (and .env).
+"""
+import os
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from dotenv import load_dotenv
+from pydantic import BaseModel, field_validator
+
+
+# Settings field -> environment variable it is read from
+_ENV_VARS = {
+    "allowed_origins": "ALLOWED_ORIGINS",
+    "host": "HOST",
+    "port": "PORT",
+    "web_concurrency": "WEB_CONCURRENCY",
+    "redis_url": "REDIS_URL",
+    "threadpool_size": "THREADPOOL_SIZE",
+    "gemini_api_key": "GEMINI_API_KEY",
+    "gemini_plan_model": "GEMINI_PLAN_MODEL",
+    "gemini_followup_model": "GEMINI_FOLLOWUP_MODEL",
+    "tomtom_api_key": "TOMTOM_API_KEY",
+}
+
+
+class Settings(BaseModel):
+    """Process-wide configuration."""
+    allowed_origins: Tuple[str, ...] = ("*",)
+    host: str = "0.0.0.0"
+    port: int = 8000
+    web_concurrency: int = 2
+    redis_url: Optional[str] = None
+    threadpool_size: int = 100
+    gemini_api_key: Optional[str] = None
+    gemini_plan_model: str = "gemini-2.5-flash"
+    gemini_followup_model: str = "gemini-2.5-flash-lite"
+    tomtom_api_key: Optional[str] = None
+
+    @field_validator("allowed_origins", mode="before")
+    @classmethod
+    def split_origins(cls, value):
+        """Accept ALLOWED_ORIGINS as a comma-separated string."""
+        if isinstance(value, str):
+            return tuple(o.strip() for o in value.split(",") if o.strip())
+        return value
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """
+    Load .env and build Settings from the environment.
+
+    Cached, so the environment is parsed once per process; tests can call
+    get_settings.cache_clear() after changing environment variables.
+
+    Returns:
+        Settings instance
+    """
+    load_dotenv()
+    return Settings(**{field: os.environ[var] for field, var in _ENV_VARS.items() if os.environ.get(var)})
@@ -4,20 +4,34 @@ DayMate Backend - FastAPI Application Entry Point
 An AI-powered assistant that helps users plan their day by combining
 real-time weather data, local news, and intelligent recommendations.
 """
-import os
-from fastapi import FastAPI, HTTPException
+import asyncio
+import anyio
+import hashlib
+import uuid
+from functools import partial
+from cachetools import TTLCache
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.concurrency import iterate_in_threadpool, run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from dotenv import load_dotenv
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from datetime import datetime
+from typing import AsyncIterator, Dict, Hashable, List, Optional, Tuple
+import orjson
+import requests
+from pydantic import TypeAdapter
 
-from app.models import PlanRequest, PlanResponse, WeatherData, NewsArticle, HealthResponse, ServiceError, ChatRequest, ChatResponse, TrafficAlert, TrafficData, RoadCondition, TrafficIncident
+from app.cache import ServiceCache, cache_key, close_redis
+from app.config import get_settings
+from app.timing import span, timing_middleware
+from app.models import PlanRequest, PlanResponse, WeatherData, NewsArticle, HealthResponse, ServiceError, ChatRequest, ChatResponse, TrafficAlert, TrafficData
 from app.services.weather import get_realtime_weather, get_weather_by_coordinates
 from app.services.news import get_local_news, get_traffic_alerts
 from app.services.traffic import get_realtime_traffic
-from app.services.ai_agent import generate_day_plan, generate_followup
+from app.services.ai_agent import generate_day_plan, generate_fallback_plan, generate_followup, stream_day_plan
+from app.services.http_client import close_sessions
 
 # Load environment variables
-load_dotenv()
+settings = get_settings()
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -25,22 +39,196 @@ app = FastAPI(
     description="AI-powered daily planning assistant combining weather, news, and intelligent recommendations",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS - Allow all origins in development, restrict in production
-allowed_origins_raw = os.getenv("ALLOWED_ORIGINS", "*")
-allowed_origins = [o.strip() for o in allowed_origins_raw.split(",") if o.strip()]
-
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=allowed_origins,
+    allow_origins=settings.allowed_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
 
+# Validators for whole lists of service dicts - one validation pass per list
+_NEWS_LIST = TypeAdapter(List[NewsArticle])
+_ALERT_LIST = TypeAdapter(List[TrafficAlert])
+
+
+# Road congestion levels that become alerts, with their priority
+_CONGESTION_PRIORITY = {"jammed": "high", "heavy": "medium"}
+
+# Incident types reported as emergencies rather than traffic
+_INCIDENT_ALERT_TYPE = {"accident": "emergency", "road_closure": "emergency"}
+
+
+# Upstream result caches - weather changes on ~10 min timescales, news ~5 min
+weather_cache = ServiceCache("weather", ttl=600)
+news_cache = ServiceCache("news", ttl=300)
+traffic_cache = ServiceCache("traffic", ttl=60)
+alerts_cache = ServiceCache("alerts", ttl=300)  # Google News RSS traffic fallback
+
+# Generated plans and chat answers, keyed by a fingerprint of the AI inputs -
+# repeat inputs skip the LLM. Generation runs at temperature 0.7-0.8, so a hit
+# replays one plausible answer rather than a fresh sample; that is the intent.
+plan_cache = ServiceCache("plan", ttl=900)
+chat_cache = ServiceCache("chat", ttl=900)
+
+
+# Browser/CDN caching for the read-only GET endpoints
+HTTP_CACHED_PREFIXES = ("/api/weather/", "/api/news/")
+HTTP_CACHE_CONTROL = "public, max-age=300, stale-while-revalidate=600"
+_etags = TTLCache(maxsize=1024, ttl=300)
+
+
+@app.middleware("http")
+async def http_cache_headers(request: Request, call_next):
+    """
+    Add ETag / Cache-Control to cacheable GET responses and answer revalidations with 304.
+
+    ETags of recent responses are remembered per path, so a matching
+    If-None-Match is answered before the route (and its upstream calls) runs.
+    """
+    path = request.url.path
+    if request.method != "GET" or not path.startswith(HTTP_CACHED_PREFIXES):
+        return await call_next(request)
+
+    if_none_match = request.headers.get("if-none-match")
+    etag = _etags.get(path)
+    if etag and if_none_match == etag:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": HTTP_CACHE_CONTROL})
+
+    response = await call_next(request)
+    if response.status_code != 200:
+        return response
+
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    response.body_iterator = _replay(body)
+
+    # Services report upstream failures as 200s flagged "error" (e.g. news
+    # placeholders) - those must not be kept by browsers or CDNs
+    try:
+        payload = orjson.loads(body)
+    except orjson.JSONDecodeError:
+        payload = None
+    if isinstance(payload, dict) and payload.get("error"):
+        _etags.pop(path, None)
+        return response
+
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    _etags[path] = etag
+    if if_none_match == etag:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": HTTP_CACHE_CONTROL})
+
+    # Set on the original headers, so repeated ones (e.g. Set-Cookie) survive
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = HTTP_CACHE_CONTROL
+    return response
+
+
+async def _replay(body: bytes) -> AsyncIterator[bytes]:
+    """Yield an already-read response body again."""
+    yield body
+
+
+# Outermost middleware - times everything below it, including the 304 short-circuit
+app.middleware("http")(timing_middleware)
+
+
+# In-flight /api/plan builds, keyed by _plan_key
+_inflight_plans: Dict[Hashable, asyncio.Future] = {}
+
+# Background AI plan jobs started by /api/plan/async, keyed by plan_id. Running
+# tasks are held in a plain dict - asyncio only keeps weak references to tasks,
+# so an evicting cache could let one be garbage-collected mid-flight - and
+# move to the TTL cache once finished.
+PLAN_STREAM_KEEPALIVE = 15
+_running_plan_jobs: Dict[str, asyncio.Task] = {}
+_plan_results = TTLCache(maxsize=1024, ttl=600)
+
+
+# Current local time as ISO text, refreshed every second by _tick_clock
+_now_iso = datetime.now().isoformat()
+
+
+async def _tick_clock():
+    """Keep _now_iso current so request handlers can read a timestamp without formatting one."""
+    global _now_iso
+    while True:
+        await asyncio.sleep(1)
+        _now_iso = datetime.now().isoformat()
+
+
+@app.on_event("startup")
+async def startup():
+    """Size the worker threadpool and start background housekeeping tasks."""
+    # Every upstream call (weather, news, traffic, Gemini) is a blocking request
+    # run in this pool, and a plan holds up to three at once plus an AI call of
+    # up to 90 s - anyio's default of 40 threads queues requests under load.
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.threadpool_size
+    app.state.clock_task = asyncio.create_task(_tick_clock())
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Stop background tasks and release pooled upstream connections."""
+    app.state.clock_task.cancel()
+    close_sessions()
+    await close_redis()
+
+
+async def _cached_call(cache: ServiceCache, key, cache_hits: dict, service: str, func, *args) -> dict:
+    """Serve a blocking service call from the cache, running it in the threadpool on a miss."""
+    with span(service):
+        result, hit = await cache.get_or_load(key, lambda: run_in_threadpool(func, *args))
+    cache_hits[service] = hit
+    return result
+
+
+async def _traffic_or_alerts(traffic_key, alerts_city: str, cache_hits: dict, *traffic_args) -> Tuple[dict, Optional[dict]]:
+    """
+    Fetch real-time traffic and, only if that fails, Google News traffic alerts.
+    
+    Chaining the fallback inside one task keeps it concurrent with the other
+    services instead of starting after all of them have finished.
+    
+    Returns:
+        Tuple of (traffic result, alerts result or None if traffic succeeded)
+    """
+    try:
+        traffic_result = await _cached_call(traffic_cache, traffic_key, cache_hits, "traffic", get_realtime_traffic, *traffic_args)
+    except Exception as e:
+        traffic_result = _unwrap_service_result(e, "traffic")
+    if not traffic_result.get("error", False):
+        return traffic_result, None
+    
+    try:
+        news_traffic = await _cached_call(
+            alerts_cache, cache_key(alerts_city), cache_hits, "alerts", get_traffic_alerts, alerts_city
+        )
+    except Exception as e:
+        news_traffic = _unwrap_service_result(e, "alerts")
+    return traffic_result, news_traffic
+
+
+def _cache_header(cache_hits: dict) -> str:
+    """Format cache hits as an X-Cache header value."""
+    return ", ".join(f"{service}={'HIT' if hit else 'MISS'}" for service, hit in cache_hits.items())
+
+
+def _unwrap_service_result(result, service: str) -> dict:
+    """Convert an exception raised by a service call into its usual error dict."""
+    if isinstance(result, Exception):
+        return {
+            "error": True,
+            "message": f"{service.title()} service unavailable: {str(result)}"
+        }
+    return result
+
+
 @app.get("/", response_model=HealthResponse)
 async def root():
     """Root endpoint - API health check."""
@@ -59,21 +247,16 @@ async def health_check():
     )
 
 
-@app.post("/api/plan", response_model=PlanResponse)
-async def generate_plan(request: PlanRequest):
+async def _fetch_plan_inputs(request: PlanRequest) -> Tuple[PlanResponse, dict, dict]:
     """
-    Generate a personalized daily plan based on weather and local news.
-    Gracefully handles partial failures - returns available data with error messages.
-    
-    Supports both:
-    - City name lookup (request.city)
-    - Coordinates for real-time location (request.latitude, request.longitude)
+    Fetch weather, news and traffic for a plan request and build everything but the AI plan.
+    Gracefully handles partial failures - failed services are reported in errors.
     
     Args:
         request: PlanRequest containing city name OR latitude/longitude coordinates
         
     Returns:
-        PlanResponse with weather data, news articles, AI plan, and any service errors
+        Tuple of (PlanResponse with an empty ai_plan, generate_day_plan kwargs, cache hits per service)
     """
     # Determine if using coordinates or city name
     use_coordinates = request.latitude is not None and request.longitude is not None
@@ -85,12 +268,30 @@ async def generate_plan(request: PlanRequest):
     errors = []
     weather_response = None
     news_response = []
+    cache_hits = {}
     
-    # Fetch weather data (graceful handling)
+    # Fetch weather, news and traffic concurrently (graceful handling).
+    # The services are blocking, so each one runs in the threadpool.
     if use_coordinates:
-        weather_data = get_weather_by_coordinates(request.latitude, request.longitude)
+        # News and traffic need a place name, which only the reverse geocode
+        # in the weather lookup can provide - they are fetched together below.
+        try:
+            weather_data = await _cached_call(
+                weather_cache, cache_key(latitude=request.latitude, longitude=request.longitude), cache_hits,
+                "weather", get_weather_by_coordinates, request.latitude, request.longitude
+            )
+        except Exception as e:
+            weather_data = _unwrap_service_result(e, "weather")
     else:
-        weather_data = get_realtime_weather(city)
+        key = cache_key(city)
+        weather_data, news_result, traffic_outcome = await asyncio.gather(
+            _cached_call(weather_cache, key, cache_hits, "weather", get_realtime_weather, city),
+            _cached_call(news_cache, key, cache_hits, "news", get_local_news, city),
+            _traffic_or_alerts(key, city, cache_hits, city),
+            return_exceptions=True
+        )
+        weather_data = _unwrap_service_result(weather_data, "weather")
+        news_result = _unwrap_service_result(news_result, "news")
     
     has_weather = not weather_data.get("error", False)
     
@@ -115,8 +316,22 @@ async def generate_plan(request: PlanRequest):
             message=weather_data.get("message", "Weather service unavailable")
         ))
     
-    # Fetch news data (graceful handling) - use display_city for news search
-    news_result = get_local_news(display_city)
+    if use_coordinates:
+        # Fetch news and traffic concurrently - use display_city for news search
+        news_result, traffic_outcome = await asyncio.gather(
+            _cached_call(news_cache, cache_key(display_city), cache_hits, "news", get_local_news, display_city),
+            _traffic_or_alerts(
+                cache_key(latitude=request.latitude, longitude=request.longitude), display_city, cache_hits,
+                display_city, request.latitude, request.longitude
+            ),
+            return_exceptions=True
+        )
+        news_result = _unwrap_service_result(news_result, "news")
+    
+    if isinstance(traffic_outcome, Exception):
+        traffic_outcome = (_unwrap_service_result(traffic_outcome, "traffic"), None)
+    traffic_result, news_traffic = traffic_outcome
+    
     news_articles = news_result.get("articles", [])
     
     if news_result.get("error", False):
@@ -125,161 +340,350 @@ async def generate_plan(request: PlanRequest):
             message=news_result.get("message", "News service unavailable")
         ))
     
-    news_response = [
-        NewsArticle(
-            title=article["title"],
-            description=article.get("description"),
-            url=article["url"],
-            source=article["source"],
-            published_at=article.get("published_at")
-        )
-        for article in news_articles
-    ]
+    news_response = _NEWS_LIST.validate_python(news_articles)
     
-    # Fetch real-time traffic data (graceful handling)
-    if use_coordinates:
-        traffic_result = get_realtime_traffic(display_city, request.latitude, request.longitude)
-    else:
-        traffic_result = get_realtime_traffic(display_city)
-
     traffic_data_response = None
     traffic_alerts_data = []
+    has_high_priority = False
 
     if not traffic_result.get("error", False):
         # Convert road conditions and incidents to legacy format for backward compatibility
         road_conditions = traffic_result.get("road_conditions", [])
         incidents = traffic_result.get("incidents", [])
 
-        # Create traffic alerts from road conditions and incidents
+        data_source = traffic_result.get("data_source", "Real-Time Traffic")
+
+        # Create traffic alerts from congested roads, noting high priority as we go
         for condition in road_conditions:
-            if condition["congestion_level"] in ["heavy", "jammed"]:
-                alert_type = "traffic"
-                priority = "high" if condition["congestion_level"] == "jammed" else "medium"
-                title = f"{condition['congestion_level'].title()} traffic on {condition['road_name']}"
-                description = f"Current speed: {condition['speed_kmh']} km/h (normal: {condition['normal_speed_kmh']} km/h)"
-
-                traffic_alerts_data.append({
-                    "title": title,
-                    "description": description,
-                    "url": "#",  # No URL for real-time data
-                    "source": traffic_result.get("data_source", "Real-Time Traffic"),
-                    "published_at": condition.get("last_updated"),
-                    "alert_type": alert_type,
-                    "priority": priority
-                })
-
-        # Add incidents as high-priority alerts
+            priority = _CONGESTION_PRIORITY.get(condition["congestion_level"])
+            if priority is None:
+                continue
+            has_high_priority = has_high_priority or priority == "high"
+            traffic_alerts_data.append({
+                "title": f"{condition['congestion_level'].title()} traffic on {condition['road_name']}",
+                "description": f"Current speed: {condition['speed_kmh']} km/h (normal: {condition['normal_speed_kmh']} km/h)",
+                "url": "#",  # No URL for real-time data
+                "source": data_source,
+                "published_at": condition.get("last_updated"),
+                "alert_type": "traffic",
+                "priority": priority
+            })
+
+        # Add incidents as alerts - critical ones are high priority
         for incident in incidents:
             priority = "high" if incident["severity"] == "critical" else "medium"
-            title = f"{incident['incident_type'].replace('_', ' ').title()} on {incident['road_name']}"
-            description = incident["description"]
-
+            has_high_priority = has_high_priority or priority == "high"
             traffic_alerts_data.append({
-                "title": title,
-                "description": description,
+                "title": f"{incident['incident_type'].replace('_', ' ').title()} on {incident['road_name']}",
+                "description": incident["description"],
                 "url": "#",
-                "source": traffic_result.get("data_source", "Real-Time Traffic"),
+                "source": data_source,
                 "published_at": incident.get("start_time"),
-                "alert_type": "emergency" if incident["incident_type"] in ["accident", "road_closure"] else "traffic",
+                "alert_type": _INCIDENT_ALERT_TYPE.get(incident["incident_type"], "traffic"),
                 "priority": priority
             })
 
         # Create TrafficData response
         traffic_data_response = TrafficData(
             error=False,
-            road_conditions=[
-                RoadCondition(
-                    road_name=rc["road_name"],
-                    congestion_level=rc["congestion_level"],
-                    speed_kmh=rc["speed_kmh"],
-                    normal_speed_kmh=rc["normal_speed_kmh"],
-                    incident_type=rc.get("incident_type"),
-                    description=rc.get("description"),
-                    last_updated=rc["last_updated"]
-                )
-                for rc in road_conditions
-            ],
-            incidents=[
-                TrafficIncident(
-                    incident_type=inc["incident_type"],
-                    severity=inc["severity"],
-                    road_name=inc["road_name"],
-                    location=inc["location"],
-                    description=inc["description"],
-                    start_time=inc["start_time"],
-                    estimated_end_time=inc.get("estimated_end_time"),
-                    delay_minutes=inc.get("delay_minutes")
-                )
-                for inc in incidents
-            ],
-            last_updated=traffic_result.get("last_updated", datetime.now().isoformat()),
+            road_conditions=road_conditions,
+            incidents=incidents,
+            last_updated=traffic_result.get("last_updated", _now_iso),
             data_source=traffic_result.get("data_source", "Unknown"),
             is_simulated=traffic_result.get("is_simulated", False)
         )
     else:
-        # If TomTom fails, fall back to Google News RSS for traffic alerts
-        news_traffic = get_traffic_alerts(display_city)
-        if not news_traffic.get("error", True):
-            for alert in news_traffic.get("alerts", []):
-                traffic_alerts_data.append(alert)
+        # If TomTom fails, fall back to the Google News RSS traffic alerts
+        if news_traffic is not None and not news_traffic.get("error", True):
+            traffic_alerts_data.extend(news_traffic.get("alerts", []))
+            # get_traffic_alerts sorts high-priority alerts first
+            has_high_priority = bool(traffic_alerts_data) and traffic_alerts_data[0].get("priority") == "high"
         else:
             errors.append(ServiceError(
                 service="traffic",
                 message=traffic_result.get("message", "Real-time traffic service unavailable")
             ))
     
-    # Generate AI plan (uses available data, graceful fallback)
-    ai_result = generate_day_plan(
-        weather_data if has_weather else None,
-        news_articles,
-        display_city,
-        request.profile,
-        request.preferences.model_dump() if request.preferences else None,
-        traffic_alerts=traffic_alerts_data
-    )
+    traffic_response = _ALERT_LIST.validate_python(traffic_alerts_data)
     
-    if ai_result.get("error", False):
-        errors.append(ServiceError(
-            service="ai",
-            message=ai_result.get("message", "AI service unavailable")
-        ))
+    ai_args = {
+        "weather_data": weather_data if has_weather else None,
+        "news_data": news_articles,
+        "city": display_city,
+        "profile": request.profile,
+        "preferences": request.preferences.model_dump() if request.preferences else None,
+        "traffic_alerts": traffic_alerts_data
+    }
     
-    ai_plan = ai_result.get("plan", "Unable to generate plan. Please try again later.")
-    
-    # Check for high priority alerts
-    has_high_priority = any(alert.get("priority") == "high" for alert in traffic_alerts_data)
-    
-    traffic_response = [
-        TrafficAlert(
-            title=alert["title"],
-            description=alert.get("description"),
-            url=alert["url"],
-            source=alert["source"],
-            published_at=alert.get("published_at"),
-            alert_type=alert.get("alert_type", "traffic"),
-            priority=alert.get("priority", "medium")
-        )
-        for alert in traffic_alerts_data
-    ]
-    
-    # Determine if this is a partial success
-    partial_success = has_weather or len(news_articles) > 0 or ai_plan
-    
-    return PlanResponse(
+    plan = PlanResponse(
         weather=weather_response,
         news=news_response,
-        ai_plan=ai_plan,
+        ai_plan="",
         city=display_city,
         errors=errors,
-        partial_success=partial_success,
+        partial_success=has_weather or len(news_articles) > 0,
         traffic_data=traffic_data_response,
         traffic_alerts=traffic_response,
         has_high_priority_alerts=has_high_priority
     )
+    return plan, ai_args, cache_hits
+
+
+def _apply_ai_result(plan: PlanResponse, ai_result: dict) -> None:
+    """Fill the AI plan into a PlanResponse, recording an AI service error if there was one."""
+    if ai_result.get("error", False):
+        plan.errors.append(ServiceError(
+            service="ai",
+            message=ai_result.get("message", "AI service unavailable")
+        ))
+    
+    plan.ai_plan = ai_result.get("plan", "Unable to generate plan. Please try again later.")
+    plan.partial_success = plan.partial_success or bool(plan.ai_plan)
+
+
+def _ai_input_key(ai_args: dict) -> str:
+    """
+    Fingerprint the inputs that shape an AI plan.
+
+    Temperature is bucketed to 2 °C and only the headlines/alerts that make
+    it into the prompt are included, so near-identical conditions share a plan.
+    """
+    weather = ai_args["weather_data"]
+    inputs = [
+        (ai_args["city"] or "").lower(),
+        ai_args["profile"],
+        ai_args["preferences"],
+        [round(weather["temp"] / 2) * 2, weather["condition"]] if weather else None,
+        [article.get("title") for article in ai_args["news_data"][:5]],
+        [[alert.get("title"), alert.get("priority")] for alert in (ai_args["traffic_alerts"] or [])[:5]]
+    ]
+    return _fingerprint(inputs)
+
+
+def _fingerprint(value) -> str:
+    """Stable short hash of JSON-serializable data (dict keys sorted)."""
+    return hashlib.blake2b(orjson.dumps(value, option=orjson.OPT_SORT_KEYS), digest_size=16).hexdigest()
+
+
+async def _generate_ai_plan(ai_args: dict, cache_hits: dict) -> dict:
+    """Generate the AI plan in the threadpool, reusing a cached plan for equivalent inputs."""
+    return await _cached_call(plan_cache, _ai_input_key(ai_args), cache_hits, "ai", partial(generate_day_plan, **ai_args))
+
+
+async def _plan_job(ai_args: dict) -> dict:
+    """Run AI plan generation in the threadpool and return the fields it adds to a plan."""
+    try:
+        ai_result = await _generate_ai_plan(ai_args, {})
+    except Exception as e:
+        ai_result = {"error": True, "message": f"AI service unavailable: {str(e)}"}
+    
+    result = {"ai_plan": ai_result.get("plan", "Unable to generate plan. Please try again later.")}
+    if ai_result.get("error", False):
+        result["error"] = {"service": "ai", "message": ai_result.get("message", "AI service unavailable")}
+    return result
+
+
+def _start_plan_job(plan_id: str, ai_args: dict) -> None:
+    """Run _plan_job in the background, keeping its result for plan_id once it finishes."""
+    task = asyncio.create_task(_plan_job(ai_args))
+    _running_plan_jobs[plan_id] = task
+    
+    def finished(task: asyncio.Task) -> None:
+        _running_plan_jobs.pop(plan_id, None)
+        if not task.cancelled():
+            _plan_results[plan_id] = task.result()
+    
+    task.add_done_callback(finished)
+
+
+def _provisional_plan(ai_args: dict) -> str:
+    """Rule-based plan to show while the AI plan is generated (local and memoized, so ~free)."""
+    weather_data = ai_args["weather_data"]
+    return generate_fallback_plan(weather_data, ai_args["news_data"], ai_args["city"], weather_data is not None)
+
+
+def _plan_json_response(plan: PlanResponse, cache_hits: dict) -> Response:
+    """
+    Encode a finished plan straight to JSON bytes with pydantic-core's serializer.
+
+    The plan is assembled from validated models, so FastAPI's response_model
+    pass (re-validate, dump to dicts, re-encode) would only repeat that work.
+    """
+    return Response(
+        content=plan.model_dump_json(),
+        media_type="application/json",
+        headers={"X-Cache": _cache_header(cache_hits)}
+    )
+
+
+def _plan_key(request: PlanRequest) -> Hashable:
+    """Key identifying plan requests that would produce the same plan."""
+    location = cache_key(request.city, request.latitude, request.longitude)
+    preferences = request.preferences.model_dump_json() if request.preferences else None
+    return (location, request.profile, preferences)
+
+
+async def _build_plan(request: PlanRequest) -> Tuple[PlanResponse, dict]:
+    """Fetch plan inputs and generate the AI plan off the event loop."""
+    plan, ai_args, cache_hits = await _fetch_plan_inputs(request)
+    
+    # Generate AI plan (uses available data, graceful fallback)
+    _apply_ai_result(plan, await _generate_ai_plan(ai_args, cache_hits))
+    return plan, cache_hits
+
+
+@app.post("/api/plan", response_model=PlanResponse)
+async def generate_plan(request: PlanRequest):
+    """
+    Generate a personalized daily plan based on weather and local news.
+    Gracefully handles partial failures - returns available data with error messages.
+    
+    Supports both:
+    - City name lookup (request.city)
+    - Coordinates for real-time location (request.latitude, request.longitude)
+    
+    Args:
+        request: PlanRequest containing city name OR latitude/longitude coordinates
+        
+    Returns:
+        PlanResponse with weather data, news articles, AI plan, and any service errors
+    """
+    # Concurrent identical requests (refreshes, multiple tabs) share one build
+    key = _plan_key(request)
+    task = _inflight_plans.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_build_plan(request))
+        _inflight_plans[key] = task
+        task.add_done_callback(lambda _: _inflight_plans.pop(key, None))
+    
+    # Shielded so one client disconnecting doesn't cancel the build for the others
+    plan, cache_hits = await asyncio.shield(task)
+    
+    return _plan_json_response(plan, cache_hits)
+
+
+@app.post("/api/plan/async", response_model=PlanResponse)
+async def generate_plan_async(request: PlanRequest):
+    """
+    Return weather, news and traffic immediately and generate the AI plan in the background.
+    
+    The response has a provisional rule-based ai_plan and a plan_id; the AI
+    plan replaces it, delivered by GET /api/plan/{plan_id}/stream once the
+    AI call finishes.
+    
+    Args:
+        request: PlanRequest containing city name OR latitude/longitude coordinates
+        
+    Returns:
+        PlanResponse with a provisional plan, plus the plan_id to stream the AI plan from
+    """
+    plan, ai_args, cache_hits = await _fetch_plan_inputs(request)
+    
+    plan.plan_id = uuid.uuid4().hex
+    plan.ai_plan = _provisional_plan(ai_args)
+    plan.partial_success = plan.partial_success or bool(plan.ai_plan)
+    _start_plan_job(plan.plan_id, ai_args)
+    
+    return _plan_json_response(plan, cache_hits)
+
+
+async def _stream_ai_plan(ai_args: dict) -> AsyncIterator[bytes]:
+    """
+    Yield NDJSON lines for the AI plan: text deltas as Gemini streams, then the final plan.
+
+    Cached plans skip streaming. If Gemini fails partway, the final line is
+    the rule-based plan (replacing any deltas already sent) rather than a
+    second Gemini call; when streaming can't start (no API key or nothing to
+    plan around) the non-streaming path answers without calling Gemini either.
+    """
+    key = _ai_input_key(ai_args)
+    if await plan_cache.get(key) is None:
+        chunks = []
+        try:
+            async for chunk in iterate_in_threadpool(stream_day_plan(**ai_args)):
+                chunks.append(chunk)
+                yield orjson.dumps({"ai_plan_delta": chunk}, option=orjson.OPT_APPEND_NEWLINE)
+        except RuntimeError:
+            chunks = None
+        except (requests.RequestException, ValueError) as e:
+            yield orjson.dumps({
+                "ai_plan": _provisional_plan(ai_args),
+                "error": {"service": "ai", "message": f"AI service unavailable: {str(e)}"}
+            }, option=orjson.OPT_APPEND_NEWLINE)
+            return
+        
+        if chunks:
+            ai_plan = "".join(chunks).strip()
+            await plan_cache.set(key, {"error": False, "plan": ai_plan})
+            yield orjson.dumps({"ai_plan": ai_plan}, option=orjson.OPT_APPEND_NEWLINE)
+            return
+    
+    yield orjson.dumps(await _plan_job(ai_args), option=orjson.OPT_APPEND_NEWLINE)
+
+
+@app.post("/api/plan/stream")
+async def generate_plan_stream(request: PlanRequest):
+    """
+    Generate a plan on a single streamed response (newline-delimited JSON).
+    
+    Lines, in order:
+    - the PlanResponse with weather, news and traffic and a provisional
+      rule-based ai_plan, sent as soon as those are fetched
+    - zero or more {"ai_plan_delta": text} lines as Gemini generates the plan
+    - a final {"ai_plan": text} line (plus error, if the AI service failed)
+      that is authoritative over the deltas
+    
+    Args:
+        request: PlanRequest containing city name OR latitude/longitude coordinates
+        
+    Returns:
+        application/x-ndjson response
+    """
+    plan, ai_args, cache_hits = await _fetch_plan_inputs(request)
+    plan.ai_plan = _provisional_plan(ai_args)
+    plan.partial_success = plan.partial_success or bool(plan.ai_plan)
+    
+    async def body():
+        yield plan.model_dump_json() + "\n"
+        async for line in _stream_ai_plan(ai_args):
+            yield line
+    
+    return StreamingResponse(body(), media_type="application/x-ndjson", headers={"X-Cache": _cache_header(cache_hits)})
+
+
+@app.get("/api/plan/{plan_id}/stream")
+async def stream_plan(plan_id: str):
+    """
+    Stream the AI plan for a plan_id from /api/plan/async as Server-Sent Events.
+    
+    Sends keep-alive comments while the plan is generating, then a single
+    "plan" event with ai_plan (and error, if the AI service failed).
+    
+    Args:
+        plan_id: Identifier returned by /api/plan/async
+        
+    Returns:
+        text/event-stream response
+    """
+    job = _running_plan_jobs.get(plan_id)
+    result = _plan_results.get(plan_id) if job is None else None
+    if job is None and result is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired plan id")
+    
+    async def events():
+        if job is not None:
+            while not job.done():
+                await asyncio.wait({job}, timeout=PLAN_STREAM_KEEPALIVE)
+                if not job.done():
+                    yield ": keep-alive\n\n"
+        plan_fields = job.result() if job is not None else result
+        yield f"event: plan\ndata: {orjson.dumps(plan_fields).decode()}\n\n"
+    
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
 
 
 @app.get("/api/weather/{city}")
-async def get_weather(city: str):
+async def get_weather(city: str, response: Response):
     """
     Get weather data for a specific city.
     
@@ -289,14 +693,16 @@ async def get_weather(city: str):
     Returns:
         Weather data dictionary or error info
     """
-    result = get_realtime_weather(city)
+    cache_hits = {}
+    result = await _cached_call(weather_cache, cache_key(city), cache_hits, "weather", get_realtime_weather, city)
     if result.get("error"):
         raise HTTPException(status_code=400, detail=result.get("message"))
+    response.headers["X-Cache"] = "HIT" if cache_hits["weather"] else "MISS"
     return result
 
 
 @app.get("/api/news/{city}")
-async def get_news(city: str):
+async def get_news(city: str, response: Response):
     """
     Get news articles for a specific city.
     
@@ -306,7 +712,9 @@ async def get_news(city: str):
     Returns:
         List of news articles or error info
     """
-    result = get_local_news(city)
+    cache_hits = {}
+    result = await _cached_call(news_cache, cache_key(city), cache_hits, "news", get_local_news, city)
+    response.headers["X-Cache"] = "HIT" if cache_hits["news"] else "MISS"
     return result
 
 
@@ -322,15 +730,20 @@ async def chat_followup(request: ChatRequest):
         ChatResponse with the AI's answer
     """
     # Convert Pydantic models back to dicts for the service
-    weather_dict = request.weather.dict() if request.weather else None
-    news_list = [article.dict() for article in request.news]
-    
-    result = generate_followup(
-        weather_data=weather_dict,
-        news_data=news_list,
-        city=request.city,
-        previous_plan=request.previous_plan or "",
-        user_message=request.message
+    weather_dict = request.weather.model_dump() if request.weather else None
+    news_list = [article.model_dump() for article in request.news]
+    
+    # Exact-match cache - the same question about the same plan reuses the answer
+    result = await _cached_call(
+        chat_cache, _fingerprint(request.model_dump()), {}, "ai",
+        partial(
+            generate_followup,
+            weather_data=weather_dict,
+            news_data=news_list,
+            city=request.city,
+            previous_plan=request.previous_plan or "",
+            user_message=request.message
+        )
     )
     
     return ChatResponse(
@@ -346,11 +759,17 @@ if __name__ == "__main__":
     try:
         import uvicorn
 
-        port = int(os.environ.get("PORT", 8000))
-        host = os.environ.get("HOST", "0.0.0.0")
-
         # Run the app when executed directly: uvicorn will bind to the provided PORT.
-        uvicorn.run("app.main:app", host=host, port=port, log_level="info")
+        # Worker processes share cached upstream results through Redis when REDIS_URL is set.
+        uvicorn.run(
+            "app.main:app",
+            host=settings.host,
+            port=settings.port,
+            log_level="info",
+            loop="uvloop",
+            http="httptools",
+            workers=settings.web_concurrency
+        )
     except Exception:
         # If uvicorn is not available or something goes wrong when run interactively,
         # we intentionally suppress errors here so importing the module for tests/CI
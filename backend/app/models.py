@@ -2,18 +2,18 @@
 Pydantic models for request/response validation.
 """
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Literal, Optional, List
 
 
 class UserPreferences(BaseModel):
     """User preferences for personalized planning."""
     name: Optional[str] = Field(None, description="User's name for personalization")
-    travel_mode: str = Field("any", description="Preferred travel mode (walking, public_transport, driving)")
+    travel_mode: Literal["any", "walking", "public_transport", "driving"] = "any"
     food_preference: str = Field("any", description="Dietary or cuisine preferences")
-    activity_type: str = Field("mixed", description="Type of activities (outdoor, indoor, shopping, cultural)")
-    pace: str = Field("medium", description="Pace of the day (relaxed, medium, packed)")
-    budget: str = Field("medium", description="Budget level (low, medium, high)")
-    companions: str = Field("solo", description="Who the user is with (solo, couple, family, friends)")
+    activity_type: Literal["mixed", "outdoor", "indoor", "shopping", "cultural"] = "mixed"
+    pace: Literal["relaxed", "medium", "packed"] = "medium"
+    budget: Literal["low", "medium", "high"] = "medium"
+    companions: Literal["solo", "couple", "family", "friends"] = "solo"
     interests: Optional[str] = Field(None, description="Additional interests or constraints")
 
 
@@ -55,14 +55,14 @@ class TrafficAlert(BaseModel):
     url: str
     source: str
     published_at: Optional[str] = None
-    alert_type: str = Field("traffic", description="Type: 'traffic' or 'emergency'")
-    priority: str = Field("medium", description="Priority: 'high' or 'medium'")
+    alert_type: Literal["traffic", "emergency"] = "traffic"
+    priority: Literal["high", "medium"] = "medium"
 
 
 class RoadCondition(BaseModel):
     """Real-time road condition data."""
     road_name: str
-    congestion_level: str = Field(..., description="Traffic congestion: 'free', 'light', 'moderate', 'heavy', 'jammed'")
+    congestion_level: Literal["free", "light", "moderate", "heavy", "jammed"]
     speed_kmh: float
     normal_speed_kmh: float
     incident_type: Optional[str] = None
@@ -73,7 +73,7 @@ class RoadCondition(BaseModel):
 class TrafficIncident(BaseModel):
     """Traffic incident or event."""
     incident_type: str = Field(..., description="Type: 'accident', 'construction', 'road_closure', 'weather', 'event'")
-    severity: str = Field(..., description="Severity: 'minor', 'major', 'critical'")
+    severity: Literal["minor", "major", "critical"]
     road_name: str
     location: str
     description: str
@@ -109,6 +109,7 @@ class PlanResponse(BaseModel):
     city: str
     errors: List[ServiceError] = []
     partial_success: bool = True
+    plan_id: Optional[str] = Field(None, description="Set by /api/plan/async - stream the AI plan from /api/plan/{plan_id}/stream")
 
 
 class ChatRequest(BaseModel):
@@ -1,148 +1,201 @@
 """
 AI Agent service for generating personalized daily plans using Google Gemini.
 """
-import os
+import logging
+import re
+import time
+import orjson
 import requests
+from functools import lru_cache
+from typing import Iterator, Optional, Tuple
+from urllib3.util.retry import Retry
 
+from ..config import get_settings
+from .http_client import create_session
 
-def generate_day_plan(weather_data: dict, news_data: list, city: str = None, profile: str = "standard", preferences: dict = None, traffic_alerts: list = None) -> dict:
+
+logger = logging.getLogger(__name__)
+
+# Gemini failures are logged at most once per interval; an outage would
+# otherwise write a line per request
+_ERROR_LOG_INTERVAL = 1.0
+_last_error_log = 0.0
+_suppressed_errors = 0
+
+
+def _log_gemini_error(msg: str, *args) -> None:
+    """Log a Gemini failure as a warning, rate-limited to one line per _ERROR_LOG_INTERVAL."""
+    global _last_error_log, _suppressed_errors
+    now = time.monotonic()
+    if now - _last_error_log < _ERROR_LOG_INTERVAL:
+        _suppressed_errors += 1
+        return
+    _last_error_log = now
+    suppressed, _suppressed_errors = _suppressed_errors, 0
+    logger.warning(msg + " (%d suppressed since last)", *args, suppressed)
+
+
+# Pooled session for Gemini calls - keeps the TLS connection to the API warm.
+# Only 429/5xx responses are retried, with jittered exponential backoff
+# (honouring Retry-After), plus one retry of a failed connect. Read timeouts
+# are never retried: the request may already be generating (and billing) a
+# plan. The last response is returned (not raised) so the status handling
+# below still applies.
+_SESSION = create_session(
+    pool_connections=4,
+    pool_maxsize=20,
+    retries=Retry(
+        total=3,
+        connect=1,
+        read=0,
+        backoff_factor=0.3,
+        backoff_jitter=0.1,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset(["POST"]),
+        raise_on_status=False
+    )
+)
+_SESSION.headers["Content-Type"] = "application/json"
+
+GEMINI_API_BASE = "https://generativelanguage.googleapis.com/v1beta/models"
+
+# Plan output is ~6 short bullets (rarely over ~300 tokens); the cap and stop
+# sequence cut off rambling tails, since decode time grows with every output
+# token. Thinking is disabled for the plan model (see reload_api_key), so none
+# of the budget goes to thinking tokens.
+_PLAN_MAX_OUTPUT_TOKENS = 400
+_PLAN_STOP_SEQUENCES = ["\n\n\n"]
+
+# API key state, keyed endpoint URLs and model-specific config, built by reload_api_key()
+_API_KEY_OK = False
+_PLAN_URL = ""
+_PLAN_STREAM_URL = ""
+_FOLLOWUP_URL = ""
+_PLAN_THINKING = {}
+
+
+def reload_api_key(refresh: bool = False) -> None:
     """
-    Generate a personalized daily plan based on weather and news data.
+    Read GEMINI_API_KEY and the model settings and rebuild the keyed Gemini URLs.
+    
+    Runs once at import against the shared cached Settings; call it again
+    with refresh=True after changing the environment.
     
     Args:
-        weather_data: Dictionary containing weather information (can be None or have error)
-        news_data: List of news article dictionaries
-        city: City name for context when weather is unavailable
-        profile: User profile type (standard, child, elderly)
-        preferences: Dictionary of user preferences (travel, food, etc.)
-        traffic_alerts: List of traffic/emergency alert dictionaries
-        
-    Returns:
-        Dictionary with plan and optional error info
+        refresh: Re-parse the environment (clearing the cached Settings for
+            every module) instead of using the cached Settings
     """
-    api_key = os.getenv("GEMINI_API_KEY")
-    
-    # Check if we have valid weather data
-    has_weather = weather_data and not weather_data.get("error", False)
-    has_news = news_data and len(news_data) > 0
-    has_traffic_alerts = traffic_alerts and len(traffic_alerts) > 0
-    
-    # Check for high priority alerts
-    high_priority_alerts = [a for a in (traffic_alerts or []) if a.get('priority') == 'high']
-    has_emergency = len(high_priority_alerts) > 0
-    
-    if not api_key or api_key == "your_gemini_api_key_here":
-        # Return a rule-based plan if Gemini is not configured
-        return {
-            "error": True,
-            "message": "AI API key not configured. Using basic recommendations.",
-            "plan": generate_fallback_plan(weather_data, news_data, city, has_weather, traffic_alerts)
-        }
-    
-    try:
-        # Build context based on available data
-        context_parts = []
-        location_name = weather_data.get('city_name', city or 'Unknown') if has_weather else (city or 'Unknown')
-        country = weather_data.get('country', '') if has_weather else ''
-        temp = weather_data.get('temp', 15) if has_weather else 15
-        condition = weather_data.get('condition', 'variable') if has_weather else 'variable'
-        
-        if has_weather:
-            context_parts.append(f"""WEATHER:
-- Location: {location_name}, {country}
-- Temperature: {temp}°C (feels like {weather_data.get('feels_like', temp)}°C)
-- Conditions: {condition} - {weather_data.get('description', '')}
-- Humidity: {weather_data.get('humidity', 'N/A')}%
-- Wind: {weather_data.get('wind_speed', 'N/A')} m/s""")
-        else:
-            context_parts.append(f"WEATHER: Not available for {city or 'this location'}")
-        
-        # Prepare news summary
-        if has_news:
-            news_headlines = [f"• {article.get('title', '')}" for article in news_data[:5] if article.get("title")]
-            news_summary = "\n".join(news_headlines)
-            context_parts.append(f"\nTODAY'S NEWS:\n{news_summary}")
-        
-        # Prepare traffic/emergency alerts - HIGH PRIORITY
-        traffic_context = ""
-        if has_traffic_alerts:
-            alert_lines = []
-            for alert in traffic_alerts[:5]:
-                priority_marker = "🚨 URGENT" if alert.get('priority') == 'high' else "⚠️"
-                alert_type = alert.get('alert_type', 'traffic').upper()
-                alert_lines.append(f"{priority_marker} [{alert_type}]: {alert.get('title', '')}")
-            
-            traffic_context = "\n".join(alert_lines)
-            context_parts.append(f"\n⚠️ TRAFFIC & EMERGENCY ALERTS (PRIORITIZE THESE):\n{traffic_context}")
-        
-        context = "\n".join(context_parts)
-        # Define profile-specific instructions (expanded for deep personalization)
-        profile_instructions = ""
-        if profile == "child":
-            profile_instructions = (
-                "PROFILE: FAMILY/CHILD (The Safety & Fun Filter)\n"
-                "- Focus: Entertainment, safety, minimal travel time, child-friendly facilities.\n"
-                "- News: Ignore political or crime news unless it poses an immediate danger. Focus on local events, parades, or park openings.\n"
-                "- Weather (Rain): Suggest indoor play zones, science museums, or libraries with reading hours. Explicitly warn to bring extra clothes.\n"
-                "- Weather (Hot): Suggest parks with water fountains or shaded playgrounds. Remind parents about sunscreen.\n"
-                "- Traffic: If traffic is bad, suggest staying in the local neighborhood to avoid trapping kids in a car for hours.\n"
-                "- Activities: Only suggest venues with child-friendly facilities (playgrounds, family restrooms, stroller access).\n"
-                "- Activity Pace: Enthusiastic, but not rushed. 2-3 main activities max.\n"
-                "- Tone: Enthusiastic and protective. Use fun language and emojis sparingly (1-2 max).\n"
-                "- Always mention safety tips for children and families."
-            )
-        elif profile == "elderly":
-            profile_instructions = (
-                "PROFILE: ELDERLY/RELAXED (The Accessibility & Comfort Filter)\n"
-                "- Focus: Accessibility, low physical impact, quiet, health safety.\n"
-                "- Mobility: Only suggest venues known for accessibility (no intense hiking). Prioritize places with seating.\n"
-                "- Weather (Cold/Rain): Strictly advise staying indoors or visiting a heated indoor mall/museum. Warn about slippery surfaces.\n"
-                "- News: Prioritize health advisories (e.g., flu season, air quality alerts).\n"
-                "- Activity Pace: Slow. 1-2 main activities max. Suggest 'afternoon tea' or 'scenic drives' rather than walking tours.\n"
-                "- Tone: Respectful, calm, and clear.\n"
-                "- Always mention comfort and safety for elderly users."
-            )
-        else:
-            profile_instructions = (
-                "PROFILE: STANDARD (The Default)\n"
-                "- Focus: Efficiency, productivity, and general leisure.\n"
-                "- Traffic: If there is traffic, suggest the fastest alternative route or a podcast to listen to.\n"
-                "- Weather (Rain): Suggest a gym or a cafe with WiFi.\n"
-                "- Activity Pace: Moderate to fast. Pack 3-4 activities in the day.\n"
-                "- Tone: Friendly, energetic, and practical.\n"
-                "- Suggest a mix of work, leisure, and local highlights."
-            )
-
-        # Define user preference instructions
-        pref_instructions = ""
-        user_name = "Friend"
-        if preferences:
-            user_name = preferences.get('name') or "Friend"
-            pref_instructions = f"""
-USER PREFERENCES:
-- Name: {user_name}
-- Travel Mode: {preferences.get('travel_mode') or 'any'}
-- Food Preference: {preferences.get('food_preference') or 'any'}
-- Activity Type: {preferences.get('activity_type') or 'mixed'}
-- Pace: {preferences.get('pace') or 'medium'}
-- Budget: {preferences.get('budget') or 'medium'}
-- Companions: {preferences.get('companions') or 'solo'}
-- Additional Notes: {preferences.get('interests') or 'None'}
-"""
+    global _API_KEY_OK, _PLAN_URL, _PLAN_STREAM_URL, _FOLLOWUP_URL, _PLAN_THINKING
+    if refresh:
+        get_settings.cache_clear()
+    settings = get_settings()
+    api_key = settings.gemini_api_key or ""
+    _API_KEY_OK = bool(api_key) and api_key != "your_gemini_api_key_here"
+    plan_model = f"{GEMINI_API_BASE}/{settings.gemini_plan_model}"
+    _PLAN_URL = f"{plan_model}:generateContent?key={api_key}"
+    _PLAN_STREAM_URL = f"{plan_model}:streamGenerateContent?alt=sse&key={api_key}"
+    _FOLLOWUP_URL = f"{GEMINI_API_BASE}/{settings.gemini_followup_model}:generateContent?key={api_key}"
+    # 2.5 models think before answering by default, which is slow and bills
+    # thinking tokens against maxOutputTokens; a daily plan doesn't need it
+    _PLAN_THINKING = {"thinkingConfig": {"thinkingBudget": 0}} if "gemini-2.5-flash" in settings.gemini_plan_model else {}
+
+
+reload_api_key()
+
+
+# Profile-specific instructions (expanded for deep personalization)
+_PROFILE_BLOCKS = {
+    "child": (
+        "PROFILE: FAMILY/CHILD\n"
+        "- Child-friendly venues only (playgrounds, family restrooms, stroller access), little travel, 2-3 unhurried activities.\n"
+        "- Rain: indoor play zones, science museums, library reading hours; bring spare clothes. Heat: water fountains, shaded playgrounds, sunscreen.\n"
+        "- Bad traffic: stay in the neighborhood. News: skip politics/crime unless it is an immediate danger; favor local events, parades, park openings.\n"
+        "- Tone: fun, enthusiastic, protective; include safety tips for families."
+    ),
+    "elderly": (
+        "PROFILE: ELDERLY/RELAXED\n"
+        "- Accessible, low-impact, quiet venues with seating; no intense hiking. 1-2 slow-paced activities (afternoon tea, scenic drives over walking tours).\n"
+        "- Cold/rain: stay indoors (heated mall, museum) and warn about slippery surfaces.\n"
+        "- News: prioritize health advisories (flu season, air quality).\n"
+        "- Tone: respectful, calm, clear; mention comfort and safety."
+    ),
+    "standard": (
+        "PROFILE: STANDARD\n"
+        "- Mix of work, leisure and local highlights; 3-4 activities at a moderate-to-fast pace.\n"
+        "- Rain: a gym or a cafe with WiFi. Traffic: the fastest alternative route, or a podcast for the drive.\n"
+        "- Tone: friendly, energetic, practical."
+    ),
+}
+
+# Per-request prompt fragments, formatted with the request's data
+_WEATHER_TEMPLATE = (
+    "WEATHER:\n"
+    "- Location: {location}, {country}\n"
+    "- Temperature: {temp}°C (feels like {feels_like}°C)\n"
+    "- Conditions: {condition} - {description}\n"
+    "- Humidity: {humidity}%\n"
+    "- Wind: {wind_speed} m/s"
+)
 
-        # Build the prompt - friendly personal assistant style
-        prompt = f"""You are DayMate, a friendly personal assistant who knows {location_name} like the back of your hand! 
+_PREFERENCES_TEMPLATE = (
+    "\n"
+    "USER PREFERENCES:\n"
+    "- Name: {name}\n"
+    "- Travel Mode: {travel_mode}\n"
+    "- Food Preference: {food_preference}\n"
+    "- Activity Type: {activity_type}\n"
+    "- Pace: {pace}\n"
+    "- Budget: {budget}\n"
+    "- Companions: {companions}\n"
+    "- Additional Notes: {interests}\n"
+)
 
-{context}
+# Shown in the prompt when a preference is missing or empty
+_PREFERENCE_DEFAULTS = {
+    "travel_mode": "any",
+    "food_preference": "any",
+    "activity_type": "mixed",
+    "pace": "medium",
+    "budget": "medium",
+    "companions": "solo",
+    "interests": "None",
+}
 
-{profile_instructions}
-{pref_instructions}
+_PRIORITY_MARKERS = {"high": "🚨 URGENT"}
 
-Create a warm, personalized daily plan for {user_name}. Be like a helpful friend who lives in {location_name}.
+_PROMPT_FOOTER = "User: {user_name} in {location_name}"
+
+_FOLLOWUP_TEMPLATE = (
+    "CITY: {location_name}\n"
+    "\n"
+    "CONTEXT:\n"
+    "{context}\n"
+    "\n"
+    "PREVIOUS PLAN GENERATED:\n"
+    "{previous_plan}\n"
+    "\n"
+    "USER SAYS:\n"
+    "\"{user_message}\"\n"
+    "\n"
+    "Response:"
+)
+
+# Bounds on per-request prompt data (input tokens dominate cost and latency)
+_MAX_HEADLINE_CHARS = 140
+_MAX_PREVIOUS_PLAN_CHARS = 1200
+
+# Bullet lines of a generated plan, e.g. "* **☀️ Morning:** Coffee at ..."
+_PLAN_BULLET_RE = re.compile(r"^.*\*\*.+?:\*\*.+$", re.MULTILINE)
+
+# Static plan instructions, sent as Gemini's systemInstruction. Keeping them
+# byte-identical across calls lets the API reuse its cached prompt prefix.
+_PLAN_SYSTEM_PROMPT = """You are DayMate, a friendly personal assistant who knows the user's city like the back of your hand!
+
+Create a warm, personalized daily plan for the user named in the request. Be like a helpful friend who lives in their city.
 
 STYLE:
 - Be warm and conversational (use "you", "your", friendly phrases)
-- Address the user as "{user_name}" at least once naturally
+- Address the user by name at least once naturally
 - Sound excited and helpful, like texting a friend recommendations
 - Use emojis sparingly (1-2 max in the whole response)
 
@@ -155,19 +208,19 @@ FORMAT - Use EXACTLY this structure (do not add introductory text like "Hey Frie
 
 * **🌆 Evening:** [Dinner/activity at REAL venue]. [Personal touch]
 
-* **💡 Local Tip:** [One insider secret about {location_name}]
+* **💡 Local Tip:** [One insider secret about the city]
 
 * **⚠️ Alert:** [If there are security/traffic alerts, summarize the key warning here briefly]
 
 REQUIREMENTS:
 1. Start DIRECTLY with the first bullet point (* **☀️ Morning:**). Do not write an intro paragraph.
-2. Name REAL specific places in {location_name} (actual restaurant names, real landmarks, specific neighborhoods)
-3. Consider the {temp}°C {condition} weather - suggest what to wear briefly
+2. Name REAL specific places in the user's city (actual restaurant names, real landmarks, specific neighborhoods)
+3. Consider today's temperature and conditions - suggest what to wear briefly
 4. Keep each point to 1-2 sentences max
 5. Sound like a friendly local, not a tour guide
 6. If news mentions events/issues, weave them in naturally
-7. STRICTLY ADHERE to the PROFILE guidelines above.
-8. **CRITICAL - TRAFFIC/EMERGENCY ALERTS**: If any alerts are shown above:
+7. STRICTLY ADHERE to the PROFILE guidelines in the request.
+8. **CRITICAL - TRAFFIC/EMERGENCY ALERTS**: If any alerts are given:
    - For HIGH PRIORITY (🚨) emergencies: WARN the user first in the Alert section, suggest avoiding affected areas, and modify plans to steer clear
    - For traffic congestion: Suggest alternative routes or times, mention leaving earlier/later
    - For road closures or accidents: Recommend specific detours or alternative destinations
@@ -175,26 +228,254 @@ REQUIREMENTS:
 
 Remember: Be specific! Say "grab a flat white at Monmouth Coffee" not "visit a local cafe"."""
 
-        # Gemini API endpoint - using gemini-2.5-flash (free tier)
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent?key={api_key}"
+# Static follow-up instructions, sent as systemInstruction
+_FOLLOWUP_SYSTEM_PROMPT = """You are DayMate, a friendly local expert for the city in the request.
+
+INSTRUCTIONS:
+Answer the user's question or request naturally.
+- Be helpful, specific, and friendly.
+- If suggesting new places, use REAL names.
+- Keep it concise (under 150 words).
+- Don't repeat the whole plan, just address the specific request."""
+
+
+def _has_plan_context(weather_data: dict, news_data: list, traffic_alerts: list) -> bool:
+    """Whether there is any weather, news or alert data for Gemini to plan around."""
+    has_weather = weather_data and not weather_data.get("error", False)
+    return bool(has_weather or news_data or traffic_alerts)
+
+
+def _headlines(news_data: list, limit: int) -> list:
+    """
+    First `limit` distinct news titles (ignoring case), each cut to _MAX_HEADLINE_CHARS.
+    
+    Stops scanning as soon as `limit` titles are found.
+    
+    Args:
+        news_data: List of news article dictionaries
+        limit: Maximum number of headlines to return
         
-        payload = {
-            "contents": [
+    Returns:
+        List of headline strings
+    """
+    seen = set()
+    headlines = []
+    for article in news_data:
+        title = (article.get("title") or "").strip()[:_MAX_HEADLINE_CHARS]
+        if title and title.lower() not in seen:
+            seen.add(title.lower())
+            headlines.append(title)
+            if len(headlines) == limit:
+                break
+    return headlines
+
+
+def _plan_outline(previous_plan: str) -> str:
+    """
+    Reduce a previous plan to its bullet lines, capped at _MAX_PREVIOUS_PLAN_CHARS.
+    
+    Plans that don't follow the bullet format are just truncated.
+    """
+    if not previous_plan:
+        return ""
+    bullets = _PLAN_BULLET_RE.findall(previous_plan)
+    outline = "\n".join(bullets) if bullets else previous_plan
+    return outline[:_MAX_PREVIOUS_PLAN_CHARS]
+
+
+def _build_plan_payload(weather_data: dict, news_data: list, city: str = None, profile: str = "standard", preferences: dict = None, traffic_alerts: list = None) -> dict:
+    """
+    Build the Gemini request body for a daily plan.
+    
+    Args:
+        weather_data: Dictionary containing weather information (can be None or have error)
+        news_data: List of news article dictionaries
+        city: City name for context when weather is unavailable
+        profile: User profile type (standard, child, elderly)
+        preferences: Dictionary of user preferences (travel, food, etc.)
+        traffic_alerts: List of traffic/emergency alert dictionaries
+        
+    Returns:
+        generateContent / streamGenerateContent payload
+    """
+    has_weather = weather_data and not weather_data.get("error", False)
+    has_news = news_data and len(news_data) > 0
+    has_traffic_alerts = traffic_alerts and len(traffic_alerts) > 0
+    
+    # Build context based on available data
+    context_parts = []
+    location_name = weather_data.get('city_name', city or 'Unknown') if has_weather else (city or 'Unknown')
+    
+    if has_weather:
+        temp = weather_data.get('temp', 15)
+        context_parts.append(_WEATHER_TEMPLATE.format(
+            location=location_name,
+            country=weather_data.get('country', ''),
+            temp=temp,
+            feels_like=weather_data.get('feels_like', temp),
+            condition=weather_data.get('condition', 'variable'),
+            description=weather_data.get('description', ''),
+            humidity=weather_data.get('humidity', 'N/A'),
+            wind_speed=weather_data.get('wind_speed', 'N/A')
+        ))
+    else:
+        context_parts.append(f"WEATHER: Not available for {city or 'this location'}")
+    
+    # Prepare news summary
+    if has_news:
+        news_summary = "\n".join([f"• {title}" for title in _headlines(news_data, 5)])
+        context_parts.append(f"\nTODAY'S NEWS:\n{news_summary}")
+    
+    # Prepare traffic/emergency alerts - HIGH PRIORITY
+    if has_traffic_alerts:
+        traffic_context = "\n".join([
+            f"{_PRIORITY_MARKERS.get(alert.get('priority'), '⚠️')} [{alert.get('alert_type', 'traffic').upper()}]: {alert.get('title', '')}"
+            for alert in traffic_alerts[:5]
+        ])
+        context_parts.append(f"\n⚠️ TRAFFIC & EMERGENCY ALERTS (PRIORITIZE THESE):\n{traffic_context}")
+    
+    # Profile-specific instructions (standard for unknown profiles)
+    profile_instructions = _PROFILE_BLOCKS.get(profile, _PROFILE_BLOCKS["standard"])
+
+    # Define user preference instructions
+    pref_instructions = ""
+    user_name = "Friend"
+    if preferences:
+        user_name = preferences.get('name') or "Friend"
+        pref_instructions = _PREFERENCES_TEMPLATE.format(
+            name=user_name,
+            **{field: preferences.get(field) or default for field, default in _PREFERENCE_DEFAULTS.items()}
+        )
+
+    # Static instructions go in systemInstruction (identical on every call, so
+    # Gemini can reuse the cached prefix); only per-request data goes here.
+    prompt = "\n".join([
+        "\n".join(context_parts),
+        "",
+        profile_instructions,
+        pref_instructions,
+        _PROMPT_FOOTER.format(user_name=user_name, location_name=location_name)
+    ])
+
+    payload = {
+        "systemInstruction": {
+            "parts": [
                 {
-                    "parts": [
-                        {
-                            "text": prompt
-                        }
-                    ]
+                    "text": _PLAN_SYSTEM_PROMPT
                 }
-            ],
-            "generationConfig": {
-                "temperature": 0.8,
-                "maxOutputTokens": 3048
+            ]
+        },
+        "contents": [
+            {
+                "parts": [
+                    {
+                        "text": prompt
+                    }
+                ]
             }
+        ],
+        "generationConfig": {
+            "temperature": 0.8,
+            "maxOutputTokens": _PLAN_MAX_OUTPUT_TOKENS,
+            "stopSequences": _PLAN_STOP_SEQUENCES,
+            **_PLAN_THINKING
         }
+    }
+    return payload
+
+
+def stream_day_plan(weather_data: dict, news_data: list, city: str = None, profile: str = "standard", preferences: dict = None, traffic_alerts: list = None) -> Iterator[str]:
+    """
+    Stream a personalized daily plan from Gemini as it is generated.
+    
+    Uses streamGenerateContent with server-sent events, so the first words
+    arrive long before the whole plan. Unlike generate_day_plan there is no
+    rule-based fallback: failures raise, and callers switch to the
+    non-streaming path.
+    
+    Args:
+        weather_data: Dictionary containing weather information (can be None or have error)
+        news_data: List of news article dictionaries
+        city: City name for context when weather is unavailable
+        profile: User profile type (standard, child, elderly)
+        preferences: Dictionary of user preferences (travel, food, etc.)
+        traffic_alerts: List of traffic/emergency alert dictionaries
         
-        response = requests.post(url, json=payload, timeout=90)
+    Yields:
+        Plan text chunks in order
+        
+    Raises:
+        RuntimeError: If no API key is configured or there is no data to plan
+            around (raised before Gemini is called)
+        ValueError: If Gemini returned no text or an unparseable frame
+        requests.RequestException: On connection failure or a non-200 response
+    """
+    if not _API_KEY_OK:
+        raise RuntimeError("AI API key not configured.")
+    if not _has_plan_context(weather_data, news_data, traffic_alerts):
+        raise RuntimeError("No weather, news or alerts to plan around.")
+    
+    payload = _build_plan_payload(weather_data, news_data, city, profile, preferences, traffic_alerts)
+    
+    produced = False
+    with _SESSION.post(_PLAN_STREAM_URL, data=orjson.dumps(payload), timeout=(3.05, 60), stream=True) as response:
+        response.raise_for_status()
+        # Raw bytes: text/event-stream carries no charset, so requests would
+        # decode it as ISO-8859-1 and mangle UTF-8 (emoji, accents)
+        for line in response.iter_lines():
+            if not line.startswith(b"data:"):
+                continue
+            candidates = orjson.loads(line[len(b"data:"):]).get("candidates") or []
+            if not candidates:
+                continue
+            for part in candidates[0].get("content", {}).get("parts", []):
+                if part.get("text"):
+                    produced = True
+                    yield part["text"]
+    
+    if not produced:
+        raise ValueError("Gemini returned no text.")
+
+
+def generate_day_plan(weather_data: dict, news_data: list, city: str = None, profile: str = "standard", preferences: dict = None, traffic_alerts: list = None) -> dict:
+    """
+    Generate a personalized daily plan based on weather and news data.
+    
+    Args:
+        weather_data: Dictionary containing weather information (can be None or have error)
+        news_data: List of news article dictionaries
+        city: City name for context when weather is unavailable
+        profile: User profile type (standard, child, elderly)
+        preferences: Dictionary of user preferences (travel, food, etc.)
+        traffic_alerts: List of traffic/emergency alert dictionaries
+        
+    Returns:
+        Dictionary with plan and optional error info; "degraded" is set when
+        there was no data and the rule-based plan was used without calling Gemini
+    """
+    # Check if we have valid weather data
+    has_weather = weather_data and not weather_data.get("error", False)
+    
+    if not _API_KEY_OK:
+        # Return a rule-based plan if Gemini is not configured
+        return {
+            "error": True,
+            "message": "AI API key not configured. Using basic recommendations.",
+            "plan": generate_fallback_plan(weather_data, news_data, city, has_weather)
+        }
+    
+    if not _has_plan_context(weather_data, news_data, traffic_alerts):
+        # Gemini can't beat the rule-based plan without any data - skip the call
+        return {
+            "error": False,
+            "plan": generate_fallback_plan(weather_data, news_data, city, has_weather),
+            "degraded": True
+        }
+    
+    payload = _build_plan_payload(weather_data, news_data, city, profile, preferences, traffic_alerts)
+    
+    try:
+        response = _SESSION.post(_PLAN_URL, data=orjson.dumps(payload), timeout=(3.05, 90))
         
         if response.status_code == 400:
             return {
@@ -211,14 +492,14 @@ Remember: Be specific! Say "grab a flat white at Monmouth Coffee" not "visit a l
             }
         
         if response.status_code != 200:
-            print(f"Gemini API error: {response.status_code} - {response.text}")
+            _log_gemini_error("Gemini API error: %s - %s", response.status_code, response.text[:300])
             return {
                 "error": True,
                 "message": "AI service temporarily unavailable. Using basic recommendations.",
                 "plan": generate_fallback_plan(weather_data, news_data, city, has_weather)
             }
         
-        result = response.json()
+        result = orjson.loads(response.content)
         
         # Extract text from Gemini response
         if "candidates" in result and len(result["candidates"]) > 0:
@@ -241,13 +522,111 @@ Remember: Be specific! Say "grab a flat white at Monmouth Coffee" not "visit a l
             "message": "AI service timed out. Using basic recommendations.",
             "plan": generate_fallback_plan(weather_data, news_data, city, has_weather)
         }
-    except Exception as e:
-        print(f"Gemini API error: {str(e)}")
+    except requests.RequestException as e:
+        _log_gemini_error("Gemini API error: %s", e)
         return {
             "error": True,
             "message": "AI service error. Using basic recommendations.",
             "plan": generate_fallback_plan(weather_data, news_data, city, has_weather)
         }
+    except (ValueError, KeyError, IndexError) as e:
+        # Malformed JSON or an unexpected response shape
+        _log_gemini_error("Gemini API returned an unexpected response: %r", e)
+        return {
+            "error": True,
+            "message": "Could not parse AI response. Using basic recommendations.",
+            "plan": generate_fallback_plan(weather_data, news_data, city, has_weather)
+        }
+
+
+# Fallback advice is keyed by a condition kind and a temperature band,
+# derived once per call; the table itself is built at import.
+_CONDITION_KINDS = (
+    ("rain", ("rain",)),
+    ("storm", ("storm",)),
+    ("drizzle", ("drizzle",)),
+    ("clear", ("clear", "sun")),
+)
+
+_TEMP_BANDS = ("hot", "warm", "mild", "cold")
+
+_NO_WEATHER_SECTIONS = {
+    "morning": [
+        "- Check the weather before heading out",
+        "- Keep an umbrella handy just in case",
+        "- Great time for morning exercise or a walk",
+    ],
+    "afternoon": [
+        "- Good time for errands and tasks",
+        "- Plan both indoor and outdoor options",
+    ],
+    "evening": [
+        "- Perfect time for dinner plans or relaxation",
+        "- Consider both indoor and outdoor dining options",
+    ],
+}
+
+
+def _condition_kind(condition: str) -> str:
+    """Map a lowercased weather condition to a _CONDITION_KINDS key ("other" if none match)."""
+    for kind, keywords in _CONDITION_KINDS:
+        if any(keyword in condition for keyword in keywords):
+            return kind
+    return "other"
+
+
+def _temp_band(temp: float) -> str:
+    """Map a temperature in °C to hot (>30), warm (>25), mild (>=10) or cold."""
+    if temp > 30:
+        return "hot"
+    if temp > 25:
+        return "warm"
+    return "mild" if temp >= 10 else "cold"
+
+
+def _fallback_sections(kind: str, band: str) -> dict:
+    """Morning/afternoon/evening advice lines for one (condition kind, temperature band) pair."""
+    if kind in ("rain", "storm", "drizzle"):
+        morning = ["- Don't forget your umbrella! Rain is expected today.",
+                   "- Consider indoor exercise like yoga or home workout."]
+    elif band == "hot":
+        morning = ["- Start your day early to avoid peak heat.",
+                   "- Stay hydrated - keep water with you."]
+    elif band == "cold":
+        morning = ["- Bundle up! It's cold outside.",
+                   "- A warm breakfast will help start your day right."]
+    else:
+        morning = ["- Great weather for a morning walk or jog!",
+                   "- Enjoy breakfast outdoors if possible."]
+
+    if kind in ("rain", "storm"):
+        afternoon = ["- Good time for indoor activities: reading, movies, or catching up on work.",
+                     "- If you must go out, plan trips between rain showers."]
+    elif band == "hot":
+        afternoon = ["- Stay indoors during peak sun hours (12-3 PM).",
+                     "- Visit air-conditioned places like malls or libraries."]
+    elif kind == "clear":
+        afternoon = ["- Perfect weather for outdoor activities!",
+                     "- Consider a lunch picnic or outdoor café."]
+    else:
+        afternoon = ["- Good time for errands and outdoor tasks.",
+                     "- Check local events happening today."]
+
+    if kind == "rain":
+        evening = ["- Cozy evening indoors - perfect for cooking or movies."]
+    elif band in ("hot", "warm"):
+        evening = ["- Enjoy the cooler evening air with a walk."]
+    else:
+        evening = ["- Great time for dinner out or evening activities."]
+
+    return {"morning": morning, "afternoon": afternoon, "evening": evening}
+
+
+_FALLBACK_TABLE = {
+    (kind, band): _fallback_sections(kind, band)
+    for kind in [k for k, _ in _CONDITION_KINDS] + ["other"]
+    for band in _TEMP_BANDS
+}
 
 
 def generate_fallback_plan(weather_data: dict, news_data: list, city: str = None, has_weather: bool = True) -> str:
@@ -272,64 +651,43 @@ def generate_fallback_plan(weather_data: dict, news_data: list, city: str = None
         condition = "unknown"
         location = city or "your area"
     
+    bucket = (_condition_kind(condition), _temp_band(temp)) if has_weather else None
+    news_title = news_data[0].get("title") if news_data else None
+    return _render_fallback_plan(location, bucket, news_title)
+
+
+@lru_cache(maxsize=512)
+def _render_fallback_plan(location: str, bucket: Optional[Tuple[str, str]], news_title: Optional[str]) -> str:
+    """
+    Assemble the fallback plan markdown; memoized since the inputs repeat across users.
+    
+    Args:
+        location: Place name for the heading
+        bucket: (condition kind, temperature band) key into _FALLBACK_TABLE, or None without weather
+        news_title: Top headline to mention, if any
+        
+    Returns:
+        Rule-based daily plan as a string
+    """
     plan_parts = [f"## Daily Plan for {location}\n"]
     
-    if not has_weather:
+    if bucket is not None:
+        sections = _FALLBACK_TABLE[bucket]
+    else:
         plan_parts.append("*Note: Weather data unavailable. Here are flexible recommendations:*\n")
+        sections = _NO_WEATHER_SECTIONS
     
-    # Morning recommendations
     plan_parts.append("### Morning")
-    if not has_weather:
-        plan_parts.append("- Check the weather before heading out")
-        plan_parts.append("- Keep an umbrella handy just in case")
-        plan_parts.append("- Great time for morning exercise or a walk")
-    elif "rain" in condition or "storm" in condition or "drizzle" in condition:
-        plan_parts.append("- Don't forget your umbrella! Rain is expected today.")
-        plan_parts.append("- Consider indoor exercise like yoga or home workout.")
-    elif temp > 30:
-        plan_parts.append("- Start your day early to avoid peak heat.")
-        plan_parts.append("- Stay hydrated - keep water with you.")
-    elif temp < 10:
-        plan_parts.append("- Bundle up! It's cold outside.")
-        plan_parts.append("- A warm breakfast will help start your day right.")
-    else:
-        plan_parts.append("- Great weather for a morning walk or jog!")
-        plan_parts.append("- Enjoy breakfast outdoors if possible.")
-    
-    # Afternoon recommendations
+    plan_parts.extend(sections["morning"])
     plan_parts.append("\n### Afternoon")
-    if not has_weather:
-        plan_parts.append("- Good time for errands and tasks")
-        plan_parts.append("- Plan both indoor and outdoor options")
-    elif "rain" in condition or "storm" in condition:
-        plan_parts.append("- Good time for indoor activities: reading, movies, or catching up on work.")
-        plan_parts.append("- If you must go out, plan trips between rain showers.")
-    elif temp > 30:
-        plan_parts.append("- Stay indoors during peak sun hours (12-3 PM).")
-        plan_parts.append("- Visit air-conditioned places like malls or libraries.")
-    elif "clear" in condition or "sun" in condition:
-        plan_parts.append("- Perfect weather for outdoor activities!")
-        plan_parts.append("- Consider a lunch picnic or outdoor café.")
-    else:
-        plan_parts.append("- Good time for errands and outdoor tasks.")
-        plan_parts.append("- Check local events happening today.")
-    
-    # Evening recommendations
+    plan_parts.extend(sections["afternoon"])
     plan_parts.append("\n### Evening")
-    if not has_weather:
-        plan_parts.append("- Perfect time for dinner plans or relaxation")
-        plan_parts.append("- Consider both indoor and outdoor dining options")
-    elif "rain" in condition:
-        plan_parts.append("- Cozy evening indoors - perfect for cooking or movies.")
-    elif temp > 25:
-        plan_parts.append("- Enjoy the cooler evening air with a walk.")
-    else:
-        plan_parts.append("- Great time for dinner out or evening activities.")
+    plan_parts.extend(sections["evening"])
     
     # Add news-based tip if available
-    if news_data and len(news_data) > 0 and news_data[0].get("title"):
+    if news_title:
         plan_parts.append(f"\n### Stay Informed")
-        plan_parts.append(f"- Check local news: {news_data[0].get('title', 'Local updates')}")
+        plan_parts.append(f"- Check local news: {news_title}")
     
     return "\n".join(plan_parts)
 
@@ -348,15 +706,19 @@ def generate_followup(weather_data: dict, news_data: list, city: str, previous_p
     Returns:
         Dictionary with response and optional error info
     """
-    api_key = os.getenv("GEMINI_API_KEY")
-    
-    if not api_key or api_key == "your_gemini_api_key_here":
+    if not _API_KEY_OK:
         return {
             "error": True,
             "message": "AI API key not configured.",
             "response": "I'm sorry, I can't answer follow-up questions right now because my AI brain isn't fully connected."
         }
     
+    if not previous_plan and not _has_plan_context(weather_data, news_data, None):
+        return {
+            "error": False,
+            "response": "I need a bit more context first - try generating a plan for your city, then ask me again!"
+        }
+    
     try:
         # Build context based on available data
         context_parts = []
@@ -369,37 +731,26 @@ def generate_followup(weather_data: dict, news_data: list, city: str, previous_p
         
         # Prepare news summary (brief)
         if news_data:
-            news_headlines = [article.get('title', '') for article in news_data[:3] if article.get("title")]
+            news_headlines = _headlines(news_data, 3)
             if news_headlines:
                 context_parts.append(f"NEWS: {'; '.join(news_headlines)}")
         
-        context = "\n".join(context_parts)
-        
-        # Build the prompt
-        prompt = f"""You are DayMate, a friendly local expert for {location_name}.
-
-CONTEXT:
-{context}
-
-PREVIOUS PLAN GENERATED:
-{previous_plan}
+        # Build the prompt (static instructions are sent as systemInstruction)
+        prompt = _FOLLOWUP_TEMPLATE.format(
+            location_name=location_name,
+            context="\n".join(context_parts),
+            previous_plan=_plan_outline(previous_plan),
+            user_message=user_message
+        )
 
-USER SAYS:
-"{user_message}"
-
-INSTRUCTIONS:
-Answer the user's question or request naturally.
-- Be helpful, specific, and friendly.
-- If suggesting new places, use REAL names.
-- Keep it concise (under 150 words).
-- Don't repeat the whole plan, just address the specific request.
-
-Response:"""
-
-        # Gemini API endpoint - using gemini-2.0-flash (free tier)
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent?key={api_key}"
-        
         payload = {
+            "systemInstruction": {
+                "parts": [
+                    {
+                        "text": _FOLLOWUP_SYSTEM_PROMPT
+                    }
+                ]
+            },
             "contents": [
                 {
                     "parts": [
@@ -415,7 +766,7 @@ Response:"""
             }
         }
         
-        response = requests.post(url, json=payload, timeout=30)
+        response = _SESSION.post(_FOLLOWUP_URL, data=orjson.dumps(payload), timeout=(3.05, 30))
         
         if response.status_code != 200:
             return {
@@ -424,7 +775,7 @@ Response:"""
                 "response": "I'm having trouble thinking of a response right now. Please try again."
             }
         
-        result = response.json()
+        result = orjson.loads(response.content)
         
         # Extract text from Gemini response
         if "candidates" in result and len(result["candidates"]) > 0:
@@ -441,7 +792,8 @@ Response:"""
             "response": "I'm not sure how to answer that. Could you rephrase?"
         }
         
-    except Exception as e:
+    except (requests.RequestException, ValueError, KeyError, IndexError) as e:
+        _log_gemini_error("Gemini follow-up error: %r", e)
         return {
             "error": True,
             "message": str(e),
@@ -0,0 +1,31 @@
+"""
+Concurrent fan-out of a blocking per-city service call over many cities.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, TypeVar
+
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+# Shared by every batch helper; the calls are network-bound
+_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix="fan-out")
+
+
+def map_unique(func: Callable[..., V], keys: Iterable[K], *args) -> Dict[K, V]:
+    """
+    Call func(key, *args) once per distinct key, in parallel.
+
+    Total time is roughly that of the slowest call rather than the sum of
+    all of them.
+
+    Args:
+        func: Blocking function taking a key and then *args
+        keys: Keys to call it for; duplicates are called once
+        *args: Extra positional arguments passed to every call
+
+    Returns:
+        Dictionary mapping each distinct key, in first-seen order, to its result
+    """
+    keys = list(dict.fromkeys(keys))
+    return dict(zip(keys, _POOL.map(lambda key: func(key, *args), keys)))
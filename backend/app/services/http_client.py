@@ -0,0 +1,43 @@
+"""
+Shared HTTP session factory for outbound API calls.
+
+Sessions keep connections to upstream hosts alive so repeated calls reuse
+pooled sockets instead of paying a fresh TCP + TLS handshake every time.
+"""
+import requests
+from requests.adapters import HTTPAdapter
+from typing import List, Optional
+from urllib3.util.retry import Retry
+
+
+_sessions: List[requests.Session] = []
+
+
+def create_session(pool_connections: int = 10, pool_maxsize: int = 20, retries: Optional[Retry] = None) -> requests.Session:
+    """
+    Create a pooled requests.Session and register it for shutdown.
+
+    Args:
+        pool_connections: Number of per-host connection pools to cache
+        pool_maxsize: Maximum number of keep-alive connections per host
+        retries: Optional urllib3 Retry policy for the session's adapter
+
+    Returns:
+        Configured requests.Session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retries if retries is not None else 0
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    _sessions.append(session)
+    return session
+
+
+def close_sessions() -> None:
+    """Close every session created by create_session (called on app shutdown)."""
+    for session in _sessions:
+        session.close()
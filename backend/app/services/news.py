@@ -1,12 +1,37 @@
 ﻿"""
 News service for fetching local news using Google News RSS (Free & Reliable).
 """
-import os
+import logging
+import re
+import threading
 import requests
-import feedparser
 import urllib.parse
-from typing import List
+import xml.etree.ElementTree as ET
+from cachetools import TTLCache
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple, Union
+from urllib3.util.retry import Retry
 
+from .fan_out import map_unique
+from .http_client import create_session
+
+
+logger = logging.getLogger(__name__)
+
+# Pooled session shared by all Google News RSS fetches. One quick retry
+# covers a dropped keep-alive connection or a transient 5xx.
+_SESSION = create_session(retries=Retry(total=1, backoff_factor=0.1, status_forcelist=[502, 503, 504], raise_on_status=False))
+
+# Google News RSS search; `query` must already be form-encoded (quote_plus)
+RSS_SEARCH_URL = "https://news.google.com/rss/search?q={query}&hl=en-US&gl=US&ceid=US:en"
+
+# (connect, read) timeouts - fail fast when Google News is unreachable
+RSS_TIMEOUT = (3.05, 10)
+
+# Last parsed items per (feed URL, limit), with the ETag / Last-Modified
+# validators needed to revalidate them
+_FEED_CACHE = TTLCache(maxsize=512, ttl=3600)
+_FEED_CACHE_LOCK = threading.Lock()
 
 # Keywords that indicate traffic or emergency alerts
 TRAFFIC_KEYWORDS = [
@@ -21,6 +46,124 @@ EMERGENCY_KEYWORDS = [
 ]
 
 
+
+def _keyword_pattern(keywords: List[str]) -> re.Pattern:
+    """Compile keywords into one alternation matching whole words (plurals allowed)."""
+    return re.compile(r"\b(?:%s)(?:e?s)?\b" % "|".join(map(re.escape, keywords)))
+
+
+# Each keyword list compiled into one alternation, so a title is scanned
+# once per list instead of once per keyword. Word boundaries keep e.g.
+# "fired" from matching "fire".
+_TRAFFIC_RE = _keyword_pattern(TRAFFIC_KEYWORDS)
+_EMERGENCY_RE = _keyword_pattern(EMERGENCY_KEYWORDS)
+
+
+def parse_feed_items(content: Union[bytes, Iterable[bytes]], limit: int) -> List[dict]:
+    """
+    Extract the first `limit` items from an RSS 2.0 document.
+    
+    Parses incrementally and stops at the limit, reading only the fields we
+    use instead of building a full feed object. When given an iterable of
+    chunks (e.g. a streamed response body), chunks after the limit is
+    reached are left unconsumed for the caller.
+    
+    Args:
+        content: Raw RSS XML, whole or as an iterable of byte chunks
+        limit: Maximum number of items to return
+        
+    Returns:
+        List of item dicts with title, link, summary, source and published
+        (None where the element is missing)
+    """
+    items = []
+    if limit <= 0:
+        return items
+    chunks = (content,) if isinstance(content, bytes) else content
+    parser = ET.XMLPullParser(events=("end",))
+    for chunk in chunks:
+        parser.feed(chunk)
+        for _, elem in parser.read_events():
+            if elem.tag != "item":
+                continue
+            items.append({
+                "title": elem.findtext("title"),
+                "link": elem.findtext("link"),
+                "summary": elem.findtext("description"),
+                "source": elem.findtext("source"),
+                "published": elem.findtext("pubDate")
+            })
+            elem.clear()
+            if len(items) >= limit:
+                return items
+    parser.close()
+    return items
+
+
+def fetch_feed_items(rss_url: str, limit: int) -> List[dict]:
+    """
+    Fetch a feed and parse up to `limit` items, revalidating the last copy if there is one.
+    
+    Sends If-None-Match / If-Modified-Since from the previous response, so an
+    unchanged feed comes back as a bodiless 304 and its parsed items are reused.
+    
+    The body is streamed into the parser, which stops once `limit` items are
+    read; the rest of the body is still downloaded (and discarded) so the
+    connection goes back to the pool.
+    
+    Args:
+        rss_url: Feed URL
+        limit: Maximum number of items to return
+        
+    Returns:
+        List of item dicts (see parse_feed_items)
+        
+    Raises:
+        requests.RequestException: On connection failure or an HTTP error status
+    """
+    key = (rss_url, limit)
+    with _FEED_CACHE_LOCK:
+        cached = _FEED_CACHE.get(key)
+    
+    headers = {}
+    if cached:
+        if cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        if cached["last_modified"]:
+            headers["If-Modified-Since"] = cached["last_modified"]
+    
+    # Streamed so the body is parsed as it arrives; parsing (not the
+    # download) stops once `limit` items have been read
+    response = _SESSION.get(rss_url, headers=headers, timeout=RSS_TIMEOUT, stream=True)
+    chunks = response.iter_content(chunk_size=16384)
+    try:
+        if response.status_code == 304 and cached:
+            # Reinsert to restart the entry's TTL - it was just revalidated
+            with _FEED_CACHE_LOCK:
+                _FEED_CACHE[key] = cached
+            return cached["items"]
+        response.raise_for_status()
+        items = parse_feed_items(chunks, limit)
+    finally:
+        # Read off the rest of the body (a feed is ~100 KB) before closing:
+        # closing a partly read response drops the socket instead of returning
+        # it to the pool, and the next fetch would pay a new TCP+TLS handshake.
+        # The download still completes; only the parsing is skipped.
+        try:
+            for _ in chunks:
+                pass
+        except requests.RequestException:
+            pass
+        response.close()
+    
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if etag or last_modified:
+        with _FEED_CACHE_LOCK:
+            _FEED_CACHE[key] = {"etag": etag, "last_modified": last_modified, "items": items}
+    return items
+
+
 def get_traffic_alerts(city: str, page_size: int = 5) -> dict:
     """
     Fetch traffic and emergency alerts for a city using Google News RSS.
@@ -33,57 +176,53 @@ def get_traffic_alerts(city: str, page_size: int = 5) -> dict:
         Dictionary with alerts list, priority flag, and error info
     """
     try:
-        encoded_city = urllib.parse.quote(city)
-        
         # Search for traffic-specific news
         traffic_query = f"{city} traffic OR accident OR road closure OR delays"
-        encoded_query = urllib.parse.quote(traffic_query)
-        rss_url = f"https://news.google.com/rss/search?q={encoded_query}&hl=en-US&gl=US&ceid=US:en"
+        rss_url = RSS_SEARCH_URL.format(query=urllib.parse.quote_plus(traffic_query))
         
-        feed = feedparser.parse(rss_url)
+        entries = fetch_feed_items(rss_url, page_size * 2)  # Fetch more to filter
         
-        alerts = []
-        high_priority_count = 0
+        # Bucketed by priority as they are found, high first
+        high_alerts = []
+        medium_alerts = []
         
-        for entry in feed.entries[:page_size * 2]:  # Fetch more to filter
-            title_lower = entry.title.lower()
+        for entry in entries:
+            if not entry["title"]:
+                continue
+            title_lower = entry["title"].casefold()
             
             # Determine alert type and priority
-            is_traffic = any(keyword in title_lower for keyword in TRAFFIC_KEYWORDS)
-            is_emergency = any(keyword in title_lower for keyword in EMERGENCY_KEYWORDS)
+            is_emergency = _EMERGENCY_RE.search(title_lower) is not None
+            is_traffic = is_emergency or _TRAFFIC_RE.search(title_lower) is not None
             
             if is_traffic or is_emergency:
                 priority = "high" if is_emergency else "medium"
                 alert_type = "emergency" if is_emergency else "traffic"
                 
-                if priority == "high":
-                    high_priority_count += 1
-                
-                alerts.append({
-                    "title": entry.title,
-                    "description": entry.summary if hasattr(entry, 'summary') else "",
-                    "url": entry.link,
-                    "source": entry.source.title if hasattr(entry, 'source') else "Google News",
-                    "published_at": entry.published if hasattr(entry, 'published') else None,
+                (high_alerts if is_emergency else medium_alerts).append({
+                    "title": entry["title"],
+                    "description": entry["summary"] or "",
+                    "url": entry["link"] or "",
+                    "source": entry["source"] or "Google News",
+                    "published_at": entry["published"],
                     "alert_type": alert_type,
                     "priority": priority
                 })
                 
-                if len(alerts) >= page_size:
+                if len(high_alerts) + len(medium_alerts) >= page_size:
                     break
         
-        # Sort by priority (high first)
-        alerts.sort(key=lambda x: 0 if x['priority'] == 'high' else 1)
+        alerts = high_alerts + medium_alerts
         
         return {
             "error": False,
             "alerts": alerts,
-            "has_high_priority": high_priority_count > 0,
+            "has_high_priority": bool(high_alerts),
             "alert_count": len(alerts)
         }
         
     except Exception as e:
-        print(f"Error fetching traffic alerts: {e}")
+        logger.warning("Error fetching traffic alerts for %s: %s", city, e)
         return {
             "error": True,
             "message": f"Traffic alerts unavailable: {str(e)}",
@@ -93,6 +232,20 @@ def get_traffic_alerts(city: str, page_size: int = 5) -> dict:
         }
 
 
+def get_alerts_for_cities(cities: List[str], page_size: int = 5) -> Dict[str, dict]:
+    """
+    Fetch traffic alerts for several cities, requesting their feeds in parallel.
+    
+    Args:
+        cities: City names to fetch alerts for
+        page_size: Number of alerts per city (default 5)
+        
+    Returns:
+        Dictionary mapping each city to its get_traffic_alerts result
+    """
+    return map_unique(get_traffic_alerts, cities, page_size)
+
+
 def get_local_news(city: str, page_size: int = 5) -> dict:
     """
     Fetch local news articles related to a city using Google News RSS.
@@ -105,16 +258,13 @@ def get_local_news(city: str, page_size: int = 5) -> dict:
         Dictionary with articles list or error info
     """
     try:
-        # Encode city name for URL
-        encoded_city = urllib.parse.quote(city)
-        
         # Google News RSS URL - searches for the city
-        rss_url = f"https://news.google.com/rss/search?q={encoded_city}&hl=en-US&gl=US&ceid=US:en"
+        rss_url = RSS_SEARCH_URL.format(query=urllib.parse.quote_plus(city))
         
-        # Parse the feed
-        feed = feedparser.parse(rss_url)
+        # Fetch over the pooled session and parse the feed
+        entries = [entry for entry in fetch_feed_items(rss_url, page_size) if entry["title"]]
         
-        if not feed.entries:
+        if not entries:
             return {
                 "error": False,
                 "message": f"No news found for {city}",
@@ -122,16 +272,13 @@ def get_local_news(city: str, page_size: int = 5) -> dict:
             }
             
         news_list = []
-        for entry in feed.entries[:page_size]:
-            # Extract image if available (Google RSS doesn't always provide clean images, but we can try)
-            # For now, we'll stick to text to be safe and fast
-            
+        for entry in entries:
             news_list.append({
-                "title": entry.title,
-                "description": entry.summary if hasattr(entry, 'summary') else "Click to read more.",
-                "url": entry.link,
-                "source": entry.source.title if hasattr(entry, 'source') else "Google News",
-                "published_at": entry.published if hasattr(entry, 'published') else None
+                "title": entry["title"],
+                "description": entry["summary"] or "Click to read more.",
+                "url": entry["link"] or "",
+                "source": entry["source"] or "Google News",
+                "published_at": entry["published"]
             })
             
         return {
@@ -140,7 +287,7 @@ def get_local_news(city: str, page_size: int = 5) -> dict:
         }
         
     except Exception as e:
-        print(f"Error fetching news: {e}")
+        logger.warning("Error fetching news for %s: %s", city, e)
         return {
             "error": True,
             "message": f"News service unavailable: {str(e)}",
@@ -148,17 +295,10 @@ def get_local_news(city: str, page_size: int = 5) -> dict:
         }
 
 
-def get_fallback_news(city: str) -> List[dict]:
-    """
-    Return fallback news when API is unavailable.
-    
-    Args:
-        city: City name for context
-        
-    Returns:
-        List of generic news placeholders
-    """
-    return [
+@lru_cache(maxsize=256)
+def _fallback_articles(city: str) -> Tuple[dict, ...]:
+    """Build the placeholder articles for a city once; callers receive copies."""
+    return (
         {
             "title": f"Local events and activities in {city}",
             "description": "Check local event listings for activities in your area.",
@@ -180,4 +320,17 @@ def get_fallback_news(city: str) -> List[dict]:
             "source": "DayMate",
             "published_at": None
         }
-    ]
+    )
+
+
+def get_fallback_news(city: str) -> List[dict]:
+    """
+    Return fallback news when API is unavailable.
+    
+    Args:
+        city: City name for context
+        
+    Returns:
+        List of generic news placeholders
+    """
+    return [dict(article) for article in _fallback_articles(city)]
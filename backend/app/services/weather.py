@@ -2,8 +2,32 @@
 Weather service for fetching real-time weather data from Open-Meteo API.
 Open-Meteo is completely FREE - no API key required!
 """
+import orjson
 import requests
+import threading
+from cachetools import TTLCache
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+from urllib3.util.retry import Retry
 
+from .fan_out import map_unique
+from .http_client import create_session
+
+
+# Pooled session shared by all Open-Meteo / Nominatim calls. Nominatim
+# requires an identifying User-Agent, so it is set once for every request.
+_SESSION = create_session(retries=Retry(total=2, backoff_factor=0.1, status_forcelist=[502, 503, 504], raise_on_status=False))
+_SESSION.headers["User-Agent"] = "DayMate/1.0"
+
+# Successful city -> coordinates lookups; a city's location doesn't change
+_GEOCODE_CACHE = TTLCache(maxsize=1024, ttl=86400)
+# Successful reverse lookups by coordinates rounded to ~1 km, which also
+# keeps repeat requests under Nominatim's 1 request/second usage limit
+_REVERSE_GEOCODE_CACHE = TTLCache(maxsize=4096, ttl=86400)
+_GEOCODE_CACHE_LOCK = threading.Lock()
+
+# Runs the reverse geocode alongside the forecast fetch for coordinate lookups
+_GEOCODE_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="reverse-geocode")
 
 # Weather code to condition mapping (WMO Weather interpretation codes)
 WEATHER_CODES = {
@@ -37,6 +61,16 @@ WEATHER_CODES = {
     99: ("Thunderstorm", "thunderstorm with heavy hail", "11d"),
 }
 
+# WEATHER_CODES as a dense table indexed by code (0-99); unknown codes read as clear
+_WEATHER_CODE_TABLE = tuple(WEATHER_CODES.get(code, WEATHER_CODES[0]) for code in range(100))
+
+
+def _weather_condition(weather_code) -> tuple:
+    """Return (condition, description, icon) for a WMO weather code."""
+    if isinstance(weather_code, int) and 0 <= weather_code < len(_WEATHER_CODE_TABLE):
+        return _WEATHER_CODE_TABLE[weather_code]
+    return WEATHER_CODES[0]
+
 
 def get_coordinates(city: str) -> dict:
     """
@@ -48,6 +82,12 @@ def get_coordinates(city: str) -> dict:
     Returns:
         Dictionary with lat, lon, city_name, country or error
     """
+    key = city.strip().lower()
+    with _GEOCODE_CACHE_LOCK:
+        cached = _GEOCODE_CACHE.get(key)
+    if cached is not None:
+        return dict(cached)
+    
     url = f"https://geocoding-api.open-meteo.com/v1/search"
     params = {
         "name": city,
@@ -57,12 +97,12 @@ def get_coordinates(city: str) -> dict:
     }
     
     try:
-        response = requests.get(url, params=params, timeout=10)
+        response = _SESSION.get(url, params=params, timeout=10)
         
         if response.status_code != 200:
             return {"error": True, "message": "Geocoding service unavailable"}
         
-        data = response.json()
+        data = orjson.loads(response.content)
         
         if "results" not in data or len(data["results"]) == 0:
             return {
@@ -71,43 +111,36 @@ def get_coordinates(city: str) -> dict:
             }
         
         result = data["results"][0]
-        return {
+        coords = {
             "error": False,
             "lat": result["latitude"],
             "lon": result["longitude"],
             "city_name": result["name"],
             "country": result.get("country_code", result.get("country", ""))
         }
+        with _GEOCODE_CACHE_LOCK:
+            _GEOCODE_CACHE[key] = coords
+        return dict(coords)
         
     except requests.Timeout:
         return {"error": True, "message": "Geocoding service timed out"}
     except requests.RequestException as e:
         return {"error": True, "message": f"Geocoding error: {str(e)}"}
+    except ValueError as e:
+        return {"error": True, "message": f"Geocoding error: {str(e)}"}
 
 
-def get_realtime_weather(city: str) -> dict:
+def _fetch_current_weather(lat: float, lon: float) -> dict:
     """
-    Fetch real-time weather data for a given city using Open-Meteo API.
-    NO API KEY REQUIRED - completely free!
+    Fetch and parse current conditions for coordinates from Open-Meteo.
     
     Args:
-        city: Name of the city to get weather for
+        lat: Latitude
+        lon: Longitude
         
     Returns:
-        Dictionary containing weather information, or error info
+        Dictionary with the weather fields (without city_name/country), or error info
     """
-    # First, get coordinates for the city
-    geo_result = get_coordinates(city)
-    
-    if geo_result.get("error"):
-        return geo_result
-    
-    lat = geo_result["lat"]
-    lon = geo_result["lon"]
-    city_name = geo_result["city_name"]
-    country = geo_result["country"]
-    
-    # Fetch weather data from Open-Meteo
     url = "https://api.open-meteo.com/v1/forecast"
     params = {
         "latitude": lat,
@@ -117,7 +150,7 @@ def get_realtime_weather(city: str) -> dict:
     }
     
     try:
-        response = requests.get(url, params=params, timeout=10)
+        response = _SESSION.get(url, params=params, timeout=10)
         
         if response.status_code != 200:
             return {
@@ -125,14 +158,14 @@ def get_realtime_weather(city: str) -> dict:
                 "message": "Weather service temporarily unavailable. Please try again."
             }
         
-        data = response.json()
+        data = orjson.loads(response.content)
         current = data.get("current", {})
         
         # Get weather condition from code
         weather_code = current.get("weather_code", 0)
-        condition, description, icon = WEATHER_CODES.get(weather_code, ("Clear", "clear sky", "01d"))
+        condition, description, icon = _weather_condition(weather_code)
         
-        weather_info = {
+        return {
             "error": False,
             "temp": round(current.get("temperature_2m", 0), 1),
             "feels_like": round(current.get("apparent_temperature", 0), 1),
@@ -140,13 +173,9 @@ def get_realtime_weather(city: str) -> dict:
             "condition": condition,
             "description": description,
             "icon": icon,
-            "wind_speed": round(current.get("wind_speed_10m", 0) / 3.6, 1),  # Convert km/h to m/s
-            "city_name": city_name,
-            "country": country
+            "wind_speed": round(current.get("wind_speed_10m", 0) / 3.6, 1)  # Convert km/h to m/s
         }
         
-        return weather_info
-        
     except requests.Timeout:
         return {
             "error": True,
@@ -157,13 +186,50 @@ def get_realtime_weather(city: str) -> dict:
             "error": True,
             "message": f"Weather service unavailable: {str(e)}"
         }
-    except (KeyError, TypeError) as e:
+    except (KeyError, TypeError, ValueError) as e:
         return {
             "error": True,
             "message": "Error parsing weather data. Please try again."
         }
 
 
+def get_realtime_weather(city: str) -> dict:
+    """
+    Fetch real-time weather data for a given city using Open-Meteo API.
+    NO API KEY REQUIRED - completely free!
+    
+    Args:
+        city: Name of the city to get weather for
+        
+    Returns:
+        Dictionary containing weather information, or error info
+    """
+    # First, get coordinates for the city
+    geo_result = get_coordinates(city)
+    
+    if geo_result.get("error"):
+        return geo_result
+    
+    weather_info = _fetch_current_weather(geo_result["lat"], geo_result["lon"])
+    if not weather_info["error"]:
+        weather_info["city_name"] = geo_result["city_name"]
+        weather_info["country"] = geo_result["country"]
+    return weather_info
+
+
+def get_realtime_weather_batch(cities: List[str]) -> Dict[str, dict]:
+    """
+    Fetch current weather for several cities concurrently.
+    
+    Args:
+        cities: City names to fetch weather for
+        
+    Returns:
+        Dictionary mapping each city to its get_realtime_weather result
+    """
+    return map_unique(get_realtime_weather, cities)
+
+
 def reverse_geocode(lat: float, lon: float) -> dict:
     """
     Get city name from coordinates using Open-Meteo reverse geocoding.
@@ -175,6 +241,12 @@ def reverse_geocode(lat: float, lon: float) -> dict:
     Returns:
         Dictionary with city_name, country or error
     """
+    key = (round(lat, 2), round(lon, 2))
+    with _GEOCODE_CACHE_LOCK:
+        cached = _REVERSE_GEOCODE_CACHE.get(key)
+    if cached is not None:
+        return dict(cached)
+    
     # Open-Meteo doesn't have reverse geocoding, so we'll use a free alternative
     url = "https://nominatim.openstreetmap.org/reverse"
     params = {
@@ -183,17 +255,14 @@ def reverse_geocode(lat: float, lon: float) -> dict:
         "format": "json",
         "zoom": 10
     }
-    headers = {
-        "User-Agent": "DayMate/1.0"  # Required by Nominatim
-    }
     
     try:
-        response = requests.get(url, params=params, headers=headers, timeout=10)
+        response = _SESSION.get(url, params=params, timeout=10)
         
         if response.status_code != 200:
             return {"error": True, "message": "Reverse geocoding unavailable"}
         
-        data = response.json()
+        data = orjson.loads(response.content)
         address = data.get("address", {})
         
         # Try to get city name from various fields
@@ -207,11 +276,14 @@ def reverse_geocode(lat: float, lon: float) -> dict:
         )
         country = address.get("country_code", "").upper() or address.get("country", "")
         
-        return {
+        place = {
             "error": False,
             "city_name": city_name,
             "country": country
         }
+        with _GEOCODE_CACHE_LOCK:
+            _REVERSE_GEOCODE_CACHE[key] = place
+        return dict(place)
         
     except Exception as e:
         return {"error": True, "message": f"Reverse geocoding error: {str(e)}"}
@@ -229,63 +301,12 @@ def get_weather_by_coordinates(lat: float, lon: float) -> dict:
     Returns:
         Dictionary containing weather information, or error info
     """
-    # Get city name from coordinates
-    geo_result = reverse_geocode(lat, lon)
-    city_name = geo_result.get("city_name", "Your Location") if not geo_result.get("error") else "Your Location"
-    country = geo_result.get("country", "") if not geo_result.get("error") else ""
-    
-    # Fetch weather data from Open-Meteo
-    url = "https://api.open-meteo.com/v1/forecast"
-    params = {
-        "latitude": lat,
-        "longitude": lon,
-        "current": "temperature_2m,relative_humidity_2m,apparent_temperature,weather_code,wind_speed_10m",
-        "timezone": "auto"
-    }
+    # Get city name from coordinates (in parallel with the forecast below)
+    geo_future = _GEOCODE_POOL.submit(reverse_geocode, lat, lon)
     
-    try:
-        response = requests.get(url, params=params, timeout=10)
-        
-        if response.status_code != 200:
-            return {
-                "error": True,
-                "message": "Weather service temporarily unavailable. Please try again."
-            }
-        
-        data = response.json()
-        current = data.get("current", {})
-        
-        # Get weather condition from code
-        weather_code = current.get("weather_code", 0)
-        condition, description, icon = WEATHER_CODES.get(weather_code, ("Clear", "clear sky", "01d"))
-        
-        weather_info = {
-            "error": False,
-            "temp": round(current.get("temperature_2m", 0), 1),
-            "feels_like": round(current.get("apparent_temperature", 0), 1),
-            "humidity": current.get("relative_humidity_2m", 0),
-            "condition": condition,
-            "description": description,
-            "icon": icon,
-            "wind_speed": round(current.get("wind_speed_10m", 0) / 3.6, 1),  # Convert km/h to m/s
-            "city_name": city_name,
-            "country": country
-        }
-        
-        return weather_info
-        
-    except requests.Timeout:
-        return {
-            "error": True,
-            "message": "Weather service timed out. Please try again later."
-        }
-    except requests.RequestException as e:
-        return {
-            "error": True,
-            "message": f"Weather service unavailable: {str(e)}"
-        }
-    except (KeyError, TypeError) as e:
-        return {
-            "error": True,
-            "message": "Error parsing weather data. Please try again."
-        }
+    weather_info = _fetch_current_weather(lat, lon)
+    if not weather_info["error"]:
+        geo_result = geo_future.result()
+        weather_info["city_name"] = geo_result.get("city_name", "Your Location") if not geo_result.get("error") else "Your Location"
+        weather_info["country"] = geo_result.get("country", "") if not geo_result.get("error") else ""
+    return weather_info
@@ -0,0 +1,55 @@
+"""
+Per-request latency tracking.
+
+Every request gets a timings dict; code under a request records named
+spans into it (weather, news, traffic, ai), and the middleware reports the
+total plus spans in a Server-Timing header and a structured log line.
+"""
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from fastapi import Request
+
+
+logger = logging.getLogger("daymate.timing")
+
+_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("timings", default=None)
+
+
+@contextmanager
+def span(name: str):
+    """Record the wall time of the enclosed block (in ms) under name for the current request."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings = _timings.get()
+        if timings is not None:
+            timings[name] = (time.perf_counter() - start) * 1000
+
+
+async def timing_middleware(request: Request, call_next):
+    """Time the request and expose total + per-service spans via Server-Timing and logs."""
+    timings: Dict[str, float] = {}
+    token = _timings.set(timings)
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        _timings.reset(token)
+    total_ms = (time.perf_counter() - start) * 1000
+
+    route = request.scope.get("route")
+    path = route.path if route is not None else request.url.path
+    response.headers["Server-Timing"] = ", ".join(
+        [f"total;dur={total_ms:.1f}"] + [f"{name};dur={ms:.1f}" for name, ms in timings.items()]
+    )
+    logger.info(
+        "request_duration route=%s method=%s status=%d total_ms=%.1f %s",
+        path, request.method, response.status_code, total_ms,
+        " ".join(f"{name}_ms={ms:.1f}" for name, ms in timings.items())
+    )
+    return response
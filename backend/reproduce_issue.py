@@ -1,11 +1,12 @@
 
 import os
 import sys
-from app.services.ai_agent import generate_day_plan
+from app.services.ai_agent import generate_day_plan, reload_api_key
 from app.models import PlanRequest, UserPreferences
 
 # Mock environment
 os.environ["GEMINI_API_KEY"] = "test_key"
+reload_api_key(refresh=True)
 
 def test_plan_generation():
     print("Testing plan generation...")
@@ -15,7 +16,7 @@ def test_plan_generation():
     try:
         req = PlanRequest(city="London", profile="standard", preferences=None)
         # Simulate main.py logic
-        prefs_dict = req.preferences.dict() if req.preferences else None
+        prefs_dict = req.preferences.model_dump() if req.preferences else None
         result = generate_day_plan({}, [], "London", req.profile, prefs_dict)
         print("Success Case 1")
     except Exception as e:
@@ -33,7 +34,7 @@ def test_plan_generation():
             # interests missing
         }
         req = PlanRequest(city="London", profile="standard", preferences=frontend_payload)
-        prefs_dict = req.preferences.dict() if req.preferences else None
+        prefs_dict = req.preferences.model_dump() if req.preferences else None
         print(f"Prefs dict: {prefs_dict}")
         result = generate_day_plan({}, [], "London", req.profile, prefs_dict)
         print("Success Case 2")
@@ -51,7 +52,7 @@ def test_plan_generation():
             "interests": None
         }
         req = PlanRequest(city="London", profile="standard", preferences=frontend_payload)
-        prefs_dict = req.preferences.dict() if req.preferences else None
+        prefs_dict = req.preferences.model_dump() if req.preferences else None
         result = generate_day_plan({}, [], "London", req.profile, prefs_dict)
         print("Success Case 3")
     except Exception as e:
@@ -1,15 +1,15 @@
 """
 Unit tests for DayMate backend services.
 """
+import orjson
 import pytest
 from unittest.mock import patch, MagicMock
-import os
 
 
 class TestWeatherService:
     """Tests for weather service using Open-Meteo (FREE, no API key needed)."""
     
-    @patch('app.services.weather.requests.get')
+    @patch('app.services.weather._SESSION.get')
     def test_get_realtime_weather_success(self, mock_get):
         """Test successful weather fetch from Open-Meteo."""
         from app.services.weather import get_realtime_weather
@@ -17,19 +17,19 @@ class TestWeatherService:
         # Mock geocoding response
         geo_response = MagicMock()
         geo_response.status_code = 200
-        geo_response.json.return_value = {
+        geo_response.content = orjson.dumps({
             "results": [{
                 "name": "London",
                 "country": "United Kingdom",
                 "latitude": 51.5074,
                 "longitude": -0.1278
             }]
-        }
+        })
         
         # Mock weather response
         weather_response = MagicMock()
         weather_response.status_code = 200
-        weather_response.json.return_value = {
+        weather_response.content = orjson.dumps({
             "current": {
                 "temperature_2m": 25.5,
                 "apparent_temperature": 26.0,
@@ -37,7 +37,7 @@ class TestWeatherService:
                 "weather_code": 0,
                 "wind_speed_10m": 3.5
             }
-        }
+        })
         
         # Return different responses for each call
         mock_get.side_effect = [geo_response, weather_response]
@@ -49,14 +49,14 @@ class TestWeatherService:
         assert result["city_name"] == "London"
         assert result["country"] == "United Kingdom"
     
-    @patch('app.services.weather.requests.get')
+    @patch('app.services.weather._SESSION.get')
     def test_get_realtime_weather_city_not_found(self, mock_get):
         """Test weather fetch with invalid city returns error dict."""
         from app.services.weather import get_realtime_weather
         
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"results": []}  # No results
+        mock_response.content = orjson.dumps({"results": []})  # No results
         mock_get.return_value = mock_response
         
         result = get_realtime_weather("InvalidCity123XYZ")
@@ -64,21 +64,21 @@ class TestWeatherService:
         assert result["error"] == True
         assert "not found" in result["message"].lower()
     
-    @patch('app.services.weather.requests.get')
+    @patch('app.services.weather._SESSION.get')
     def test_get_coordinates_success(self, mock_get):
         """Test geocoding API returns coordinates."""
         from app.services.weather import get_coordinates
         
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_response.content = orjson.dumps({
             "results": [{
                 "name": "Paris",
                 "country": "France",
                 "latitude": 48.8566,
                 "longitude": 2.3522
             }]
-        }
+        })
         mock_get.return_value = mock_response
         
         result = get_coordinates("Paris")
@@ -87,37 +87,72 @@ class TestWeatherService:
         assert result["city_name"] == "Paris"
         assert result["country"] == "France"
         assert result["lat"] == 48.8566
+        
+        # Repeat lookups are served from the cache
+        assert get_coordinates(" paris ")["lat"] == 48.8566
+        assert mock_get.call_count == 1
+
+    
+    @patch('app.services.weather._SESSION.get')
+    def test_reverse_geocode_cached(self, mock_get):
+        """Test reverse geocoding reuses results for nearby coordinates."""
+        from app.services.weather import reverse_geocode
+        
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.content = orjson.dumps({"address": {"town": "Whitby", "country_code": "gb"}})
+        mock_get.return_value = mock_response
+        
+        first = reverse_geocode(54.4863, -0.6133)
+        second = reverse_geocode(54.4858, -0.6129)
+        
+        assert first == second == {"error": False, "city_name": "Whitby", "country": "GB"}
+        assert mock_get.call_count == 1
+    
+    def test_map_unique_runs_calls_in_parallel(self):
+        """Test batch fan-out runs distinct keys concurrently and passes extra args."""
+        import threading
+        from app.services.fan_out import map_unique
+        
+        # Each call waits for the other two, so this only finishes if all three overlap
+        barrier = threading.Barrier(3, timeout=5)
+        
+        def lookup(city, units):
+            barrier.wait()
+            return f"{city}:{units}"
+        
+        result = map_unique(lookup, ["Oslo", "Rome", "Oslo", "Lima"], "metric")
+        
+        assert result == {"Oslo": "Oslo:metric", "Rome": "Rome:metric", "Lima": "Lima:metric"}
 
 
 class TestNewsService:
     """Tests for news service."""
     
-    @patch('app.services.news.requests.get')
-    @patch.dict(os.environ, {'NEWS_API_KEY': 'test_key'})
+    @patch('app.services.news._SESSION.get')
     def test_get_local_news_success(self, mock_get):
-        """Test successful news fetch."""
+        """Test successful news fetch from Google News RSS."""
         from app.services.news import get_local_news
         
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "articles": [
-                {
-                    "title": "Test News 1",
-                    "description": "Description 1",
-                    "url": "http://test.com/1",
-                    "source": {"name": "Test Source"},
-                    "publishedAt": "2024-01-01T00:00:00Z"
-                },
-                {
-                    "title": "Test News 2",
-                    "description": "Description 2",
-                    "url": "http://test.com/2",
-                    "source": {"name": "Test Source 2"},
-                    "publishedAt": "2024-01-01T00:00:00Z"
-                }
-            ]
-        }
+        mock_response.iter_content.return_value = [b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>Google News</title>
+<item>
+  <title>Test News 1</title>
+  <link>http://test.com/1</link>
+  <description>Description 1</description>
+  <source url="http://test.com">Test Source</source>
+  <pubDate>Mon, 01 Jan 2024 00:00:00 GMT</pubDate>
+</item>
+<item>
+  <title>Test News 2</title>
+  <link>http://test.com/2</link>
+  <description>Description 2</description>
+  <source url="http://test.com">Test Source 2</source>
+  <pubDate>Mon, 01 Jan 2024 00:00:00 GMT</pubDate>
+</item>
+</channel></rss>"""]
         mock_get.return_value = mock_response
         
         result = get_local_news("London")
@@ -125,6 +160,84 @@ class TestNewsService:
         assert result["error"] == False
         assert len(result["articles"]) == 2
         assert result["articles"][0]["title"] == "Test News 1"
+        assert result["articles"][0]["url"] == "http://test.com/1"
+        assert result["articles"][1]["source"] == "Test Source 2"
+    
+    def test_parse_feed_items_limit(self):
+        """Test RSS parsing stops at the limit and tolerates missing elements."""
+        from app.services.news import parse_feed_items
+        
+        content = b"""<rss version="2.0"><channel>
+<item><title>One</title><link>http://a/1</link></item>
+<item><title>Two</title></item>
+<item><title>Three</title></item>
+</channel></rss>"""
+        
+        items = parse_feed_items(content, 2)
+        
+        assert [item["title"] for item in items] == ["One", "Two"]
+        assert items[0]["link"] == "http://a/1"
+        assert items[1]["source"] is None
+        
+        # Chunks after the limit are left for the caller to drain
+        chunks = iter([content[:60], content[60:], b"<never-read/>"])
+        assert len(parse_feed_items(chunks, 1)) == 1
+        assert next(chunks) == b"<never-read/>"
+
+    @patch('app.services.news._SESSION.get')
+    def test_fetch_feed_items_revalidates(self, mock_get):
+        """Test a feed is revalidated with its ETag and a 304 reuses the parsed items."""
+        from app.services.news import fetch_feed_items
+
+        first = MagicMock()
+        first.status_code = 200
+        first.headers = {"ETag": '"v1"'}
+        first.iter_content.return_value = [b"<rss><channel><item><title>One</title></item></channel></rss>"]
+        not_modified = MagicMock()
+        not_modified.status_code = 304
+        not_modified.iter_content.return_value = []
+        mock_get.side_effect = [first, not_modified]
+
+        url = "https://news.example/rss?q=revalidate"
+        assert fetch_feed_items(url, 5)[0]["title"] == "One"
+        assert fetch_feed_items(url, 5)[0]["title"] == "One"
+        assert mock_get.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+
+    @patch('app.services.news._SESSION.get')
+    def test_get_traffic_alerts_keywords(self, mock_get):
+        """Test alerts match whole keywords and list emergencies first."""
+        from app.services.news import get_traffic_alerts
+        
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.iter_content.return_value = [b"""<rss version="2.0"><channel>
+<item><title>Crashes slow the M25</title></item>
+<item><title>Fired chef opens new restaurant</title></item>
+<item><title>Flood warning for the Thames</title></item>
+</channel></rss>"""]
+        mock_get.return_value = mock_response
+        
+        result = get_traffic_alerts("Leeds")
+        
+        assert result["error"] == False
+        assert [alert["title"] for alert in result["alerts"]] == [
+            "Flood warning for the Thames", "Crashes slow the M25"
+        ]
+        assert result["alerts"][0]["priority"] == "high"
+        assert result["has_high_priority"] == True
+    
+    @patch('app.services.news.get_traffic_alerts')
+    def test_get_alerts_for_cities(self, mock_alerts):
+        """Test batched alerts are keyed by city and fetched once per city."""
+        from app.services.news import get_alerts_for_cities
+        
+        mock_alerts.side_effect = lambda city, page_size: {"error": False, "city": city}
+        
+        result = get_alerts_for_cities(["Leeds", "York", "Leeds"])
+        
+        assert list(result) == ["Leeds", "York"]
+        assert result["York"]["city"] == "York"
+        assert mock_alerts.call_count == 2
     
     def test_get_fallback_news(self):
         """Test fallback news generation."""
@@ -136,6 +249,87 @@ class TestNewsService:
         assert "London" in result[0]["title"]
 
 
+class TestTrafficService:
+    """Tests for TomTom traffic service."""
+    
+    @patch('app.services.traffic._SESSION.get')
+    def test_fetch_tomtom_incidents_bad_timestamps(self, mock_get):
+        """Test one incident with an unparseable time doesn't drop the rest."""
+        from app.services.traffic import RealTimeTrafficService
+        
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.content = orjson.dumps({
+            "incidents": [
+                {"properties": {"iconCategory": 1, "delay": 40, "startTime": "2024-01-01T08:00:00Z", "endTime": "2024-01-01T09:00:00Z"}},
+                {"properties": {"iconCategory": 7, "delay": None, "startTime": "not a date"}}
+            ]
+        })
+        mock_get.return_value = mock_response
+        
+        service = RealTimeTrafficService()
+        service.tomtom_key = "test-key"
+        incidents = service._fetch_tomtom_incidents(51.5, -0.12)
+        
+        assert [inc.incident_type for inc in incidents] == ["accident", "road_closure"]
+        assert incidents[0].severity == "critical"
+        assert incidents[0].estimated_end_time.hour == 9
+        assert incidents[1].severity == "minor"
+        assert incidents[1].estimated_end_time is None
+
+    @patch('app.services.traffic._REFRESH_POOL')
+    def test_realtime_traffic_cached_and_refreshed_when_stale(self, mock_pool):
+        """Test a TomTom result is cached, and a stale hit schedules one refresh."""
+        from app.services.traffic import RealTimeTrafficService
+
+        service = RealTimeTrafficService()
+        live = {
+            "error": False,
+            "road_conditions": [{"road_name": "Oxford Street", "congestion_level": "light"}],
+            "incidents": []
+        }
+
+        with patch.object(service, '_fetch_tomtom_traffic', return_value=live) as mock_fetch:
+            assert service.get_realtime_traffic("London", 51.5, -0.12) is live
+            assert service.get_realtime_traffic("London", 51.5, -0.12) is live
+            assert mock_fetch.call_count == 1
+
+            # Expire the fresh window: served stale, refreshed once in the background
+            key = service._cache_key("London", 51.5, -0.12)
+            service.cache[key] = (live, 0)
+            assert service.get_realtime_traffic("London", 51.5, -0.12) is live
+            assert service.get_realtime_traffic("London", 51.5, -0.12) is live
+            assert mock_pool.submit.call_count == 1
+
+            mock_pool.submit.call_args[0][0]()
+            assert mock_fetch.call_count == 2
+            assert service.cache[key][1] > 0
+
+        assert key not in service._negative_cache
+
+    @patch('app.services.traffic.get_traffic_alerts')
+    def test_realtime_traffic_failure_uses_negative_cache(self, mock_alerts):
+        """Test a failed TomTom lookup goes to the short negative cache only."""
+        from app.services.traffic import RealTimeTrafficService
+
+        mock_alerts.return_value = {"error": False, "alerts": [], "has_high_priority": False}
+        service = RealTimeTrafficService()
+        failed = {"error": True, "road_conditions": [], "incidents": []}
+
+        with patch.object(service, '_fetch_tomtom_traffic', return_value=failed) as mock_fetch:
+            first = service.get_realtime_traffic("Dhaka", 23.81, 90.41)
+            second = service.get_realtime_traffic("Dhaka", 23.81, 90.41)
+
+        key = service._cache_key("Dhaka", 23.81, 90.41)
+        assert first is second
+        assert "Google News RSS" in first["data_source"]
+        assert mock_fetch.call_count == 1
+        mock_alerts.assert_called_once_with("Dhaka", page_size=5)
+        assert key in service._negative_cache
+        assert key not in service.cache
+        assert service._negative_cache.ttl < service.cache.ttl
+
+
 class TestAIAgent:
     """Tests for AI agent service."""
     
@@ -203,15 +397,15 @@ class TestAIAgent:
         assert "unavailable" in result.lower() or "flexible" in result.lower()
         assert "Unknown City" in result
     
-    @patch('app.services.ai_agent.requests.post')
-    @patch.dict(os.environ, {'GEMINI_API_KEY': 'test_key'})
+    @patch('app.services.ai_agent._SESSION.post')
+    @patch('app.services.ai_agent._API_KEY_OK', True)
     def test_generate_day_plan_with_gemini(self, mock_post):
         """Test AI plan generation with Gemini API."""
         from app.services.ai_agent import generate_day_plan
         
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_response.content = orjson.dumps({
             "candidates": [
                 {
                     "content": {
@@ -221,7 +415,7 @@ class TestAIAgent:
                     }
                 }
             ]
-        }
+        })
         mock_post.return_value = mock_response
         
         weather_data = {
@@ -241,7 +435,7 @@ class TestAIAgent:
         assert result["error"] == False
         assert "Daily Plan" in result["plan"] or "Morning" in result["plan"]
     
-    @patch.dict(os.environ, {'GEMINI_API_KEY': ''})
+    @patch('app.services.ai_agent._API_KEY_OK', False)
     def test_generate_day_plan_no_api_key(self):
         """Test AI plan generation falls back when no API key."""
         from app.services.ai_agent import generate_day_plan
@@ -259,15 +453,28 @@ class TestAIAgent:
         assert "plan" in result
         assert len(result["plan"]) > 0
     
-    @patch('app.services.ai_agent.requests.post')
-    @patch.dict(os.environ, {'GEMINI_API_KEY': 'test_key'})
+    @patch('app.services.ai_agent._SESSION.post')
+    @patch('app.services.ai_agent._API_KEY_OK', True)
+    def test_generate_day_plan_without_data(self, mock_post):
+        """Test AI plan generation skips Gemini when there is no weather, news or alerts."""
+        from app.services.ai_agent import generate_day_plan
+        
+        result = generate_day_plan({"error": True}, [], "London")
+        
+        assert result["error"] == False
+        assert result["degraded"] == True
+        assert "London" in result["plan"]
+        assert not mock_post.called
+    
+    @patch('app.services.ai_agent._SESSION.post')
+    @patch('app.services.ai_agent._API_KEY_OK', True)
     def test_generate_day_plan_with_preferences(self, mock_post):
         """Test AI plan generation with user preferences."""
         from app.services.ai_agent import generate_day_plan
         
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_response.content = orjson.dumps({
             "candidates": [
                 {
                     "content": {
@@ -277,7 +484,7 @@ class TestAIAgent:
                     }
                 }
             ]
-        }
+        })
         mock_post.return_value = mock_response
         
         weather_data = {"city_name": "London", "country": "GB"}
@@ -295,7 +502,203 @@ class TestAIAgent:
         # Verify preferences were included in the prompt
         assert mock_post.called
         args, kwargs = mock_post.call_args
-        request_body = kwargs['json']
+        request_body = orjson.loads(kwargs['data'])
         prompt_text = request_body['contents'][0]['parts'][0]['text']
         assert "USER PREFERENCES" in prompt_text
+        # Static instructions travel separately so the prompt prefix is cacheable
+        assert "FORMAT" in request_body['systemInstruction']['parts'][0]['text']
+        assert "FORMAT" not in prompt_text
         assert "vegan" in prompt_text
+    
+    @patch('app.services.ai_agent._SESSION.post')
+    @patch('app.services.ai_agent._API_KEY_OK', True)
+    def test_stream_day_plan(self, mock_post):
+        """Test streamed plan generation yields text from each SSE frame."""
+        from app.services.ai_agent import stream_day_plan
+        
+        import io
+        import requests
+        
+        # A real Response over UTF-8 bytes, with no charset in the content type
+        body = "\n\n".join(
+            "data: " + orjson.dumps({"candidates": [{"content": {"parts": [{"text": text}]}}]}).decode()
+            for text in ["* **Morning:** ", "☀️ Coffee at a café"]
+        ).encode("utf-8")
+        response = requests.Response()
+        response.status_code = 200
+        response.headers["Content-Type"] = "text/event-stream"
+        response.raw = io.BytesIO(body)
+        mock_post.return_value = response
+        
+        weather_data = {"temp": 20, "condition": "Clear", "city_name": "London", "country": "GB"}
+        
+        chunks = list(stream_day_plan(weather_data, [], "London"))
+        
+        assert "".join(chunks) == "* **Morning:** ☀️ Coffee at a café"
+        args, kwargs = mock_post.call_args
+        assert ":streamGenerateContent?alt=sse" in args[0]
+        assert kwargs['stream'] == True
+    
+    @patch('app.services.ai_agent._SESSION.post')
+    @patch('app.services.ai_agent._API_KEY_OK', True)
+    def test_generate_followup_trims_context(self, mock_post):
+        """Test follow-up prompts carry only plan bullets and bounded, distinct headlines."""
+        from app.services.ai_agent import generate_followup
+        
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.content = orjson.dumps({
+            "candidates": [{"content": {"parts": [{"text": "Try the museum."}]}}]
+        })
+        mock_post.return_value = mock_response
+        
+        previous_plan = "Intro text\n* **☀️ Morning:** Coffee at Monmouth.\n" + "filler " * 500
+        news_data = [{"title": "x" * 300}, {"title": "x" * 300}, {"title": "Other"}]
+        
+        result = generate_followup(None, news_data, "London", previous_plan, "Anything indoors?")
+        
+        assert result["error"] == False
+        prompt_text = orjson.loads(mock_post.call_args[1]['data'])['contents'][0]['parts'][0]['text']
+        assert "* **☀️ Morning:** Coffee at Monmouth." in prompt_text
+        assert "filler" not in prompt_text
+        assert "NEWS: " + "x" * 140 + "; Other" in prompt_text
+
+
+class TestServiceCache:
+    """Tests for the single-flight service result cache."""
+
+    @pytest.mark.asyncio
+    async def test_get_or_load_caches_success(self):
+        """Test a successful load is cached and served as a hit."""
+        from app.cache import ServiceCache
+
+        cache = ServiceCache("test", ttl=60)
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            return {"error": False, "value": 1}
+
+        assert await cache.get_or_load("k", loader) == ({"error": False, "value": 1}, False)
+        assert await cache.get_or_load("k", loader) == ({"error": False, "value": 1}, True)
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_get_or_load_shares_failed_load(self):
+        """Test concurrent callers share one failing load, which is not cached."""
+        import asyncio
+        from app.cache import ServiceCache
+
+        cache = ServiceCache("test", ttl=60)
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {"error": True, "message": "upstream down"}
+
+        results = await asyncio.gather(*(cache.get_or_load("k", loader) for _ in range(5)))
+
+        assert len(calls) == 1
+        assert all(result == ({"error": True, "message": "upstream down"}, False) for result in results)
+        assert "k" not in cache._inflight
+
+        # Errors aren't cached, so the next call retries upstream
+        await cache.get_or_load("k", loader)
+        assert len(calls) == 2
+
+
+class TestHTTPCacheHeaders:
+    """Tests for ETag / Cache-Control on the cacheable GET endpoints."""
+
+    @patch('app.main.get_local_news')
+    def test_news_etag_revalidation(self, mock_news):
+        """Test a repeat request with the ETag gets a 304 without rerunning the route."""
+        from fastapi.testclient import TestClient
+        from app.main import app, news_cache, _etags
+
+        news_cache._cache.clear()
+        _etags.clear()
+        mock_news.return_value = {"error": False, "articles": [], "city": "Oslo"}
+        client = TestClient(app)
+
+        first = client.get("/api/news/Oslo")
+        assert first.status_code == 200
+        assert first.headers["Cache-Control"].startswith("public")
+
+        second = client.get("/api/news/Oslo", headers={"If-None-Match": first.headers["ETag"]})
+        assert second.status_code == 304
+        assert second.headers["ETag"] == first.headers["ETag"]
+        assert mock_news.call_count == 1
+
+    @patch('app.main.get_local_news')
+    def test_news_error_not_cacheable(self, mock_news):
+        """Test an error payload gets no ETag or Cache-Control."""
+        from fastapi.testclient import TestClient
+        from app.main import app, news_cache, _etags
+
+        news_cache._cache.clear()
+        _etags.clear()
+        mock_news.return_value = {"error": True, "message": "News unavailable", "articles": []}
+        client = TestClient(app)
+
+        response = client.get("/api/news/Oslo")
+
+        assert response.status_code == 200
+        assert response.json()["error"] == True
+        assert "ETag" not in response.headers
+        assert "Cache-Control" not in response.headers
+        assert "/api/news/Oslo" not in _etags
+
+
+class TestAsyncPlan:
+    """Tests for background AI plan jobs."""
+
+    @patch('app.main._plan_job')
+    @patch('app.main._fetch_plan_inputs')
+    def test_plan_async_result_streamed(self, mock_inputs, mock_job):
+        """Test the provisional plan comes back at once and the AI plan is streamed by plan_id."""
+        from fastapi.testclient import TestClient
+        from app.main import app, _running_plan_jobs, _plan_results
+        from app.models import PlanResponse
+
+        ai_args = {"weather_data": None, "news_data": [], "city": "Oslo"}
+        mock_inputs.return_value = (PlanResponse(ai_plan="", city="Oslo", partial_success=False), ai_args, {})
+        mock_job.return_value = {"ai_plan": "AI plan for Oslo"}
+
+        with TestClient(app) as client:
+            plan = client.post("/api/plan/async", json={"city": "Oslo"}).json()
+            assert plan["ai_plan"]
+            assert plan["partial_success"] == True
+
+            stream = client.get(f"/api/plan/{plan['plan_id']}/stream")
+
+        assert 'data: {"ai_plan":"AI plan for Oslo"}' in stream.text
+        assert plan["plan_id"] not in _running_plan_jobs
+        assert _plan_results[plan["plan_id"]] == {"ai_plan": "AI plan for Oslo"}
+
+    @pytest.mark.asyncio
+    @patch('app.main.generate_day_plan')
+    @patch('app.main.stream_day_plan')
+    async def test_stream_failure_falls_back_without_second_call(self, mock_stream, mock_plan):
+        """Test a Gemini failure mid-stream ends with the rule-based plan, not another Gemini call."""
+        import requests
+        from app.main import _stream_ai_plan, plan_cache
+
+        def broken_stream(**kwargs):
+            yield "* **Morning:** "
+            raise requests.ConnectionError("connection reset")
+
+        mock_stream.side_effect = broken_stream
+        plan_cache._cache.clear()
+        ai_args = {
+            "weather_data": None, "news_data": [], "city": "Bergen",
+            "profile": "standard", "preferences": None, "traffic_alerts": []
+        }
+
+        lines = [orjson.loads(line) async for line in _stream_ai_plan(ai_args)]
+
+        assert lines[0] == {"ai_plan_delta": "* **Morning:** "}
+        assert "Bergen" in lines[-1]["ai_plan"]
+        assert lines[-1]["error"]["service"] == "ai"
+        assert not mock_plan.called